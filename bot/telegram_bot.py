@@ -17,7 +17,7 @@ from services.sheets_service import sheets_service
 from services.database_service import database_service
 from services.audio_service import audio_service
 from services.transcription_manager import transcription_manager
-from database.sqlite_db import get_db_session
+from database.sqlite_db import db_session
 from database.models import Transaction, UserConfig
 from models.schemas import MessageInput, ProcessedTransaction, TransactionStatus, InterpretedTransaction, AudioMessage, PendingTranscription
 
@@ -735,8 +735,9 @@ Detalhes: {str(e)}
         """Definir ou atualizar uma meta"""
         from services.goal_service import goal_service
         from models.schemas import ExpenseCategory
-        from decimal import Decimal, InvalidOperation
+        from decimal import InvalidOperation
         from datetime import datetime
+        from utils.helpers import parse_money
         
         try:
             # Log da tentativa de criação de meta
@@ -780,7 +781,7 @@ Detalhes: {str(e)}
                     )
                     return
                 
-                valor = Decimal(valor_input_clean.replace(',', '.'))
+                valor = parse_money(valor_input_clean)
                 
                 # Validar valores especiais (infinity, NaN)
                 if valor.is_infinite() or valor.is_nan():
@@ -1243,7 +1244,7 @@ Exemplo: `/meta Alimentação 0`
                                source_type: str = "text", transcribed_text: str = None) -> ProcessedTransaction:
         """Salvar transação no database"""
         try:
-            async for db in get_db_session():
+            async with db_session() as db:
                 transaction = Transaction(
                     original_message=message_data.text,
                     user_id=message_data.user_id,
@@ -1278,7 +1279,7 @@ Exemplo: `/meta Alimentação 0`
     async def _update_transaction_sheets_info(self, transaction_id: int, row_number: int):
         """Atualizar informações do Google Sheets na transação"""
         try:
-            async for db in get_db_session():
+            async with db_session() as db:
                 transaction = await db.get(Transaction, transaction_id)
                 if transaction:
                     transaction.sheets_row_number = row_number
@@ -1832,7 +1833,7 @@ Salvo na planilha Google! Use /resumo para ver totais.
     async def _ensure_user_config(self, user_id: int):
         """Garantir que usuário tem Configuração"""
         try:
-            async for db in get_db_session():
+            async with db_session() as db:
                 result = await db.execute(
                     select(UserConfig).where(UserConfig.user_id == user_id)
                 )
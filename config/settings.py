@@ -31,6 +31,11 @@ class Settings(BaseSettings):
         default=["Alimentação", "Transporte", "Saúde", "Lazer", "Casa", "Finanças", "Outros"]
     )
 
+    health_min_cache_hit_rate: float = Field(default=40.0, description="Taxa de acerto mínima do cache (%)")
+    health_max_cache_size: int = Field(default=100, description="Períodos em cache antes de alertar")
+    health_max_active_cooldowns: int = Field(default=50, description="Cooldowns ativos antes de alertar")
+    health_max_hit_rate_drop: float = Field(default=15.0, description="Queda da taxa de acerto recente em relação à acumulada (pontos %)")
+
     model_config = ConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -3,7 +3,7 @@ Database package - SQLite database models and connections
 """
 
 from .models import Transaction, AIPromptCache, UserConfig, Base
-from .sqlite_db import get_db_session, init_database
+from .sqlite_db import get_db_session, db_session, init_database
 
 __all__ = [
     'Transaction',
@@ -11,5 +11,6 @@ __all__ = [
     'UserConfig',
     'Base',
     'get_db_session',
+    'db_session',
     'init_database'
 ]
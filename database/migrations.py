@@ -174,13 +174,26 @@ def migrate_optimize_transactions_indexes():
         
         indexes_created = []
         
-        # Índice composto para queries de gastos por categoria e período
-        if 'idx_transactions_user_cat_period' not in existing_indexes:
+        # Substituído por idx_transactions_user_cat_status_date, que tem as mesmas colunas iniciais
+        if 'idx_transactions_user_cat_period' in existing_indexes:
+            cursor.execute("DROP INDEX idx_transactions_user_cat_period")
+            print("Índice redundante idx_transactions_user_cat_period removido.")
+        
+        # Índice cobrindo o SUM de gastos do mês: igualdades primeiro, faixa de datas por último
+        if 'idx_transactions_user_cat_status_date' not in existing_indexes:
+            cursor.execute("""
+                CREATE INDEX idx_transactions_user_cat_status_date 
+                ON transactions(user_id, categoria, status, data_transacao, valor)
+            """)
+            indexes_created.append("idx_transactions_user_cat_status_date")
+        
+        # Mesmo SUM sem filtro de usuário, usado no progresso de metas
+        if 'idx_transactions_cat_status_date' not in existing_indexes:
             cursor.execute("""
-                CREATE INDEX idx_transactions_user_cat_period 
-                ON transactions(user_id, categoria, data_transacao, status)
+                CREATE INDEX idx_transactions_cat_status_date 
+                ON transactions(categoria, status, data_transacao, valor)
             """)
-            indexes_created.append("idx_transactions_user_cat_period")
+            indexes_created.append("idx_transactions_cat_status_date")
         
         # Índice para queries de período
         if 'idx_transactions_period_status' not in existing_indexes:
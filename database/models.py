@@ -2,7 +2,7 @@
 Modelos SQLAlchemy para o banco de dados
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, Date, Numeric, Text, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Date, Numeric, Text, Boolean, Index, UniqueConstraint
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.sql import func
 
@@ -12,6 +12,12 @@ Base = declarative_base()
 class Transaction(Base):
     """Modelo de transação financeira"""
     __tablename__ = "transactions"
+    __table_args__ = (
+        # Igualdades primeiro e a faixa de datas por último; valor torna os índices cobrindo o SUM
+        Index("idx_transactions_user_cat_status_date", "user_id", "categoria", "status", "data_transacao", "valor"),
+        # Gastos compartilhados do mês por categoria, sem filtro de usuário (progresso de metas)
+        Index("idx_transactions_cat_status_date", "categoria", "status", "data_transacao", "valor"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
 
@@ -85,6 +91,9 @@ class UserConfig(Base):
 class Goal(Base):
     """Modelo de meta financeira"""
     __tablename__ = "goals"
+    __table_args__ = (
+        UniqueConstraint("user_id", "categoria", "mes", "ano", name="uq_goals_user_categoria_periodo"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(Integer, nullable=False, comment="ID do usuário Telegram")
@@ -97,4 +106,19 @@ class Goal(Base):
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), comment="Última atualização")
 
     def __repr__(self):
-        return f"<Goal(id={self.id}, user_id={self.user_id}, categoria='{self.categoria}', valor_meta={self.valor_meta}, mes={self.mes}, ano={self.ano})>"
\ No newline at end of file
+        return f"<Goal(id={self.id}, user_id={self.user_id}, categoria='{self.categoria}', valor_meta={self.valor_meta}, mes={self.mes}, ano={self.ano})>"
+
+
+class CleanupWatermark(Base):
+    """Ponto de retomada da limpeza de dados antigos"""
+    __tablename__ = "cleanup_watermark"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(50), unique=True, nullable=False, comment="Dados limpos (ex.: 'goals')")
+    ano = Column(Integer, nullable=False, comment="Ano do primeiro período não limpo")
+    mes = Column(Integer, nullable=False, comment="Mês do primeiro período não limpo (1-12)")
+
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), comment="Última atualização")
+
+    def __repr__(self):
+        return f"<CleanupWatermark(name='{self.name}', mes={self.mes}, ano={self.ano})>"
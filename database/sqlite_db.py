@@ -2,7 +2,8 @@
 Configuração do banco SQLite
 """
 
-from typing import AsyncGenerator
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, AsyncIterator
 
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import sessionmaker
@@ -53,6 +54,13 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+@asynccontextmanager
+async def db_session() -> AsyncIterator[AsyncSession]:
+    """Obter sessão do banco, fechada ao sair do bloco mesmo com return dentro dele"""
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
 def get_sync_db_session():
     """Obter sessão síncrona do banco"""
     db = SessionLocal()
@@ -163,6 +163,15 @@ class AlertType(str, Enum):
     EXCEEDED_100_PERCENT = "exceeded_100"
 
 
+def goal_status_for_percent(percentual: float) -> GoalStatus:
+    """Status da meta para um percentual de progresso (80% e 100% são os limites)"""
+    if percentual >= 100:
+        return GoalStatus.LIMITE_EXCEDIDO
+    if percentual >= 80:
+        return GoalStatus.PROXIMO_LIMITE
+    return GoalStatus.DENTRO_META
+
+
 class PendingTranscription(BaseModel):
     """Transcrição pendente de confirmação"""
     id: str = Field(..., description="UUID único da transcrição")
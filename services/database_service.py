@@ -5,11 +5,13 @@ Fonte principal para todos os relatórios e análises
 
 from datetime import datetime
 from typing import Dict, Any, List
-from sqlalchemy import select, func, extract, and_
+from sqlalchemy import select, func, and_
 from loguru import logger
 
-from database.sqlite_db import get_db_session
+from database.sqlite_db import db_session
 from database.models import Transaction, Goal
+from models.schemas import GoalStatus, goal_status_for_percent
+from utils.helpers import calculate_progress_percent, month_date_range, year_date_range
 
 
 class DatabaseService:
@@ -23,11 +25,10 @@ class DatabaseService:
                 month = month or now.month
                 year = year or now.year
 
-            async for db in get_db_session():
+            async with db_session() as db:
                 # Construir condições da query
                 conditions = [
-                    extract('month', Transaction.data_transacao) == month,
-                    extract('year', Transaction.data_transacao) == year,
+                    Transaction.data_transacao.between(*month_date_range(year, month)),
                     Transaction.status == 'processed'
                 ]
                 
@@ -62,8 +63,7 @@ class DatabaseService:
 
                 # Obter estatísticas por tipo de origem para o período
                 source_conditions = [
-                    extract('month', Transaction.data_transacao) == month,
-                    extract('year', Transaction.data_transacao) == year,
+                    Transaction.data_transacao.between(*month_date_range(year, month)),
                     Transaction.status == 'processed'
                 ]
                 
@@ -109,10 +109,10 @@ class DatabaseService:
             if year is None:
                 year = datetime.now().year
 
-            async for db in get_db_session():
+            async with db_session() as db:
                 # Construir condições da query
                 conditions = [
-                    extract('year', Transaction.data_transacao) == year,
+                    Transaction.data_transacao.between(*year_date_range(year)),
                     Transaction.status == 'processed'
                 ]
                 
@@ -150,7 +150,7 @@ class DatabaseService:
 
                 # Obter estatísticas por tipo de origem para o ano
                 source_conditions = [
-                    extract('year', Transaction.data_transacao) == year,
+                    Transaction.data_transacao.between(*year_date_range(year)),
                     Transaction.status == 'processed'
                 ]
                 
@@ -196,7 +196,7 @@ class DatabaseService:
     async def get_transactions_for_period(self, period_type: str, period_value: str = None) -> List[Dict[str, Any]]:
         """Obter transações para um período específico (para insights)"""
         try:
-            async for db in get_db_session():
+            async with db_session() as db:
                 if period_type == "monthly":
                     if period_value:
                         meses_pt = {
@@ -215,8 +215,7 @@ class DatabaseService:
                         select(Transaction)
                         .where(
                             and_(
-                                extract('month', Transaction.data_transacao) == month,
-                                extract('year', Transaction.data_transacao) == year,
+                                Transaction.data_transacao.between(*month_date_range(year, month)),
                                 Transaction.status == 'processed'
                             )
                         )
@@ -229,7 +228,7 @@ class DatabaseService:
                         select(Transaction)
                         .where(
                             and_(
-                                extract('year', Transaction.data_transacao) == year,
+                                Transaction.data_transacao.between(*year_date_range(year)),
                                 Transaction.status == 'processed'
                             )
                         )
@@ -268,7 +267,7 @@ class DatabaseService:
             if year is None:
                 year = datetime.now().year
 
-            async for db in get_db_session():
+            async with db_session() as db:
                 result = await db.execute(
                     select(
                         Transaction.categoria,
@@ -280,7 +279,7 @@ class DatabaseService:
                     )
                     .where(
                         and_(
-                            extract('year', Transaction.data_transacao) == year,
+                            Transaction.data_transacao.between(*year_date_range(year)),
                             Transaction.status == 'processed'
                         )
                     )
@@ -307,7 +306,7 @@ class DatabaseService:
     async def get_database_stats(self) -> Dict[str, Any]:
         """Estatísticas gerais do banco de dados"""
         try:
-            async for db in get_db_session():
+            async with db_session() as db:
                 total_result = await db.execute(
                     select(func.count(Transaction.id))
                     .where(Transaction.status == 'processed')
@@ -382,15 +381,14 @@ class DatabaseService:
             Total gasto na categoria no período
         """
         try:
-            async for db in get_db_session():
+            async with db_session() as db:
                 result = await db.execute(
                     select(func.sum(Transaction.valor))
                     .where(
                         and_(
                             Transaction.user_id == user_id,
                             Transaction.categoria == categoria,
-                            extract('month', Transaction.data_transacao) == mes,
-                            extract('year', Transaction.data_transacao) == ano,
+                            Transaction.data_transacao.between(*month_date_range(ano, mes)),
                             Transaction.status == 'processed'
                         )
                     )
@@ -425,7 +423,7 @@ class DatabaseService:
                 mes = mes or now.month
                 ano = ano or now.year
 
-            async for db in get_db_session():
+            async with db_session() as db:
                 # Buscar todas as metas do usuário para o período
                 goals_result = await db.execute(
                     select(Goal)
@@ -458,15 +456,10 @@ class DatabaseService:
                     )
                     
                     valor_meta = float(goal.valor_meta)
-                    progresso_percentual = (gasto_atual / valor_meta * 100) if valor_meta > 0 else 0
+                    progresso_percentual = calculate_progress_percent(gasto_atual, valor_meta)
                     
-                    # Determinar status da meta
-                    if progresso_percentual >= 100:
-                        status = "LIMITE_EXCEDIDO"
-                    elif progresso_percentual >= 80:
-                        status = "PROXIMO_LIMITE"
-                    else:
-                        status = "DENTRO_META"
+                    # Status pelo nome do membro, como esta estatística sempre expôs
+                    status = goal_status_for_percent(progresso_percentual).name
 
                     metas_info.append({
                         "id": goal.id,
@@ -483,9 +476,9 @@ class DatabaseService:
                     total_valor_gasto += gasto_atual
 
                 # Calcular estatísticas gerais
-                metas_dentro = sum(1 for m in metas_info if m["status"] == "DENTRO_META")
-                metas_proximo = sum(1 for m in metas_info if m["status"] == "PROXIMO_LIMITE")
-                metas_excedidas = sum(1 for m in metas_info if m["status"] == "LIMITE_EXCEDIDO")
+                metas_dentro = sum(1 for m in metas_info if m["status"] == GoalStatus.DENTRO_META.name)
+                metas_proximo = sum(1 for m in metas_info if m["status"] == GoalStatus.PROXIMO_LIMITE.name)
+                metas_excedidas = sum(1 for m in metas_info if m["status"] == GoalStatus.LIMITE_EXCEDIDO.name)
 
                 return {
                     "mes": mes,
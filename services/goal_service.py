@@ -3,45 +3,331 @@ Serviço de gerenciamento de metas financeiras
 """
 
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any, Tuple
+from typing import Optional, List, Dict, Any, Iterator, Mapping, NamedTuple, Tuple
 from decimal import Decimal
-from sqlalchemy import select, and_, extract, func, delete
+from functools import lru_cache
+from types import MappingProxyType
+from sqlalchemy import select, and_, func, delete, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from loguru import logger
-import unicodedata
 import re
+import time
+from array import array
 from collections import defaultdict
+from enum import IntEnum
 
-from database.sqlite_db import get_db_session
-from database.models import Goal, Transaction
+from database.sqlite_db import db_session
+from database.models import CleanupWatermark, Goal, Transaction
 from models.schemas import (
-    ExpenseCategory, GoalCreate, GoalResponse, GoalStatus,
-    GoalAlert, AlertType
+    ExpenseCategory, GoalCreate, GoalResponse, GoalAlert,
+    AlertType, goal_status_for_percent
 )
+from utils.helpers import calculate_progress_percent, is_valid_month, month_date_range, strip_accents
+
+
+# Metas por INSERT em create_or_update_goals_bulk, abaixo do limite de parâmetros do SQLite
+_BULK_UPSERT_PAGE_SIZE = 500
+
+# Nomes das categorias sem acentos e em minúsculas, calculados uma única vez
+_NORMALIZED_CATEGORIES: Tuple[Tuple[str, ExpenseCategory], ...] = tuple(
+    (strip_accents(category.value).lower(), category) for category in ExpenseCategory
+)
+
+
+def _match_category_by_name(normalized: str) -> Optional[ExpenseCategory]:
+    """Busca exata e, para textos com 3+ caracteres, por substring"""
+    for category_normalized, category in _NORMALIZED_CATEGORIES:
+        if normalized == category_normalized:
+            return category
+    
+    if len(normalized) >= 3:
+        for category_normalized, category in _NORMALIZED_CATEGORIES:
+            if normalized in category_normalized or category_normalized in normalized:
+                return category
+    
+    return None
+
+
+@lru_cache()
+def _build_category_aliases() -> Mapping[str, ExpenseCategory]:
+    """
+    Constrói a tabela de aliases: nomes normalizados e seus prefixos (3+ caracteres),
+    resolvidos com a mesma regra da busca exata/substring.
+    """
+    aliases = {
+        category_normalized[:length]: _match_category_by_name(category_normalized[:length])
+        for category_normalized, _ in _NORMALIZED_CATEGORIES
+        for length in range(3, len(category_normalized) + 1)
+    }
+    return MappingProxyType(aliases)
+
+
+_CATEGORY_ALIASES = _build_category_aliases()
+
+# Espaços e pontuação nas pontas do texto ("Saúde???", "  Casa...")
+_EDGE_PUNCTUATION = re.compile(r'^[\W_]+|[\W_]+$')
+
+
+def _levenshtein_distance(s1: str, s2: str) -> int:
+    """Calcula a distância de Levenshtein entre duas strings"""
+    if len(s1) < len(s2):
+        return _levenshtein_distance(s2, s1)
+    
+    if len(s2) == 0:
+        return len(s1)
+    
+    previous_row = range(len(s2) + 1)
+    for i, c1 in enumerate(s1):
+        current_row = [i + 1]
+        for j, c2 in enumerate(s2):
+            insertions = previous_row[j + 1] + 1
+            deletions = current_row[j] + 1
+            substitutions = previous_row[j] + (c1 != c2)
+            current_row.append(min(insertions, deletions, substitutions))
+        previous_row = current_row
+    
+    return previous_row[-1]
+
+
+@lru_cache(maxsize=2048)
+def _resolve_normalized_category(normalized: str) -> Optional[ExpenseCategory]:
+    """
+    Resolve texto já normalizado (sem acentos, minúsculo, pontas limpas).
+    
+    O resultado fica em cache: variações de caixa, acento e espaços do mesmo
+    texto chegam aqui com a mesma chave.
+    """
+    # Busca direta na tabela de aliases (nomes completos e prefixos)
+    alias = _CATEGORY_ALIASES.get(normalized)
+    if alias is not None:
+        return alias
+    
+    # Buscas por substring e similaridade exigem pelo menos 3 caracteres
+    if len(normalized) < 3:
+        return None
+    
+    # Busca por substring (permite "mentacao" para "Alimentação")
+    category = _match_category_by_name(normalized)
+    if category is not None:
+        return category
+    
+    # Busca por similaridade (Levenshtein distance)
+    best_match = None
+    best_distance = float('inf')
+    
+    for category_normalized, category in _NORMALIZED_CATEGORIES:
+        # Aceitar se a distância for menor que 30% do tamanho da string
+        threshold = max(len(normalized), len(category_normalized)) * 0.3
+        
+        # A distância nunca é menor que a diferença de tamanho: evita o cálculo O(m·n)
+        if abs(len(normalized) - len(category_normalized)) > threshold:
+            continue
+        
+        distance = _levenshtein_distance(normalized, category_normalized)
+        
+        if distance < best_distance and distance <= threshold:
+            best_distance = distance
+            best_match = category
+            
+            # Correspondência exata já saiu pelos aliases: distância 1 não pode ser superada
+            if distance == 1:
+                break
+    
+    return best_match
+
+
+def _validate_goal_fields(user_id: int, categoria: ExpenseCategory, valor_meta: Decimal, mes: int, ano: int):
+    """
+    Valida os campos de uma meta antes de gravá-la.
+    
+    Raises:
+        ValueError: Se algum campo for inválido
+    """
+    if not isinstance(user_id, int) or user_id <= 0:
+        logger.error(f"❌ user_id inválido: {user_id}")
+        raise ValueError(f"user_id deve ser um inteiro positivo: {user_id}")
+    
+    if not isinstance(categoria, ExpenseCategory):
+        logger.error(f"❌ Categoria inválida: {categoria}")
+        raise ValueError(f"categoria deve ser um ExpenseCategory: {categoria}")
+    
+    if not isinstance(valor_meta, Decimal) or valor_meta <= 0:
+        logger.error(f"❌ valor_meta inválido: {valor_meta}")
+        raise ValueError(f"valor_meta deve ser um Decimal positivo: {valor_meta}")
+    
+    if valor_meta.is_infinite() or valor_meta.is_nan():
+        logger.error(f"❌ valor_meta especial inválido: {valor_meta}")
+        raise ValueError(f"valor_meta não pode ser infinito ou NaN: {valor_meta}")
+    
+    if not is_valid_month(mes):
+        logger.error(f"❌ Mês inválido: {mes}")
+        raise ValueError(f"mes deve estar entre 1 e 12: {mes}")
+    
+    if not (2020 <= ano <= 2030):
+        logger.error(f"❌ Ano inválido: {ano}")
+        raise ValueError(f"ano deve estar entre 2020 e 2030: {ano}")
+
+
+# Peso do intervalo mais recente na média móvel da taxa de acerto, e duração do intervalo
+_HIT_RATE_EWMA_ALPHA = 0.1
+_HIT_RATE_EWMA_TICK_SECONDS = 60
+
+
+class MetricCounter(IntEnum):
+    """Índices dos contadores de uso no array de métricas do GoalService"""
+    GOALS_CREATED = 0
+    GOALS_UPDATED = 1
+    GOALS_DELETED = 2
+    GOALS_QUERIED = 3
+    CACHE_HITS = 4
+    CACHE_MISSES = 5
+    ALERTS_SENT = 6
+
+
+# Nomes dos contadores em get_metrics(), na ordem dos índices
+_COUNTER_NAMES = tuple(counter.name.lower() for counter in MetricCounter)
+_COUNTER_INDEX = {name: index for index, name in enumerate(_COUNTER_NAMES)}
+
+
+def _zeroed_counters() -> array:
+    """Array de contadores de uso zerados, um inteiro de 64 bits por MetricCounter"""
+    return array('q', bytes(8 * len(MetricCounter)))
+
+
+class _MetricsView(Mapping[str, Any]):
+    """
+    Métricas de uso somente leitura, retornadas por GoalService.get_metrics.
+    
+    Contadores, tamanhos e a média móvel são lidos na criação; taxa de acerto,
+    média móvel arredondada e uptime são calculados no primeiro acesso.
+    """
+    
+    __slots__ = ("_counters", "_ewma", "_fields")
+    
+    _KEYS = _COUNTER_NAMES + (
+        "last_reset",
+        "uptime_seconds",
+        "cache_hit_rate_percent",
+        "cache_hit_rate_ewma",
+        "cache_size",
+        "active_cooldowns",
+    )
+    
+    def __init__(
+        self,
+        counters: Tuple[int, ...],
+        last_reset: datetime,
+        ewma: Optional[float],
+        cache_size: int,
+        active_cooldowns: int
+    ):
+        self._counters = counters
+        self._ewma = ewma
+        self._fields: Dict[str, Any] = {
+            "last_reset": last_reset,
+            "cache_size": cache_size,
+            "active_cooldowns": active_cooldowns,
+        }
+    
+    def _uptime_seconds(self) -> float:
+        return (datetime.now() - self._fields["last_reset"]).total_seconds()
+    
+    def _cache_hit_rate_percent(self) -> float:
+        hits = self._counters[MetricCounter.CACHE_HITS]
+        total = hits + self._counters[MetricCounter.CACHE_MISSES]
+        return round(hits / total * 100 if total > 0 else 0, 2)
+    
+    def _cache_hit_rate_ewma(self) -> float:
+        # Antes do primeiro tick a tendência é a própria taxa acumulada
+        if self._ewma is None:
+            return self["cache_hit_rate_percent"]
+        return round(self._ewma, 2)
+    
+    _DERIVED = {
+        "uptime_seconds": _uptime_seconds,
+        "cache_hit_rate_percent": _cache_hit_rate_percent,
+        "cache_hit_rate_ewma": _cache_hit_rate_ewma,
+    }
+    
+    def __getitem__(self, key: str) -> Any:
+        index = _COUNTER_INDEX.get(key)
+        if index is not None:
+            return self._counters[index]
+        if key in self._fields:
+            return self._fields[key]
+        
+        # KeyError para chaves desconhecidas, como em um dict
+        value = self._fields[key] = self._DERIVED[key](self)
+        return value
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._KEYS)
+    
+    def __len__(self) -> int:
+        return len(self._KEYS)
+    
+    def __repr__(self) -> str:
+        return f"_MetricsView({dict(self)!r})"
+
+
+class _CachedGoal(NamedTuple):
+    """Campos de uma meta usados no cálculo de progresso, sem o objeto ORM"""
+    id: int
+    categoria: str
+    valor_meta: Decimal
+
+
+# Nome do registro de CleanupWatermark usado pela limpeza de metas
+_GOALS_WATERMARK = "goals"
+
+
+async def _store_watermark(db, period: Tuple[int, int]):
+    """Gravar a marca d'água da limpeza de metas na sessão dada, sem commit"""
+    ano, mes = period
+    result = await db.execute(
+        select(CleanupWatermark).where(CleanupWatermark.name == _GOALS_WATERMARK)
+    )
+    watermark = result.scalar_one_or_none()
+    
+    if watermark:
+        watermark.ano = ano
+        watermark.mes = mes
+    else:
+        db.add(CleanupWatermark(name=_GOALS_WATERMARK, ano=ano, mes=mes))
+
+
+def _period_range_condition(start: Optional[Tuple[int, int]], end: Tuple[int, int]):
+    """Filtro das metas com período (ano, mês) em [start, end); start None não limita"""
+    period = tuple_(Goal.ano, Goal.mes)
+    if start is None:
+        return period < end
+    return and_(period >= start, period < end)
 
 
 class GoalService:
     """Serviço para gerenciamento de metas financeiras"""
     
-    # Cache de alertas enviados para evitar spam (categoria -> timestamp)
-    _alert_cooldown: Dict[str, datetime] = {}
-    
-    # Cache em memória para metas ativas
-    # Estrutura: {(user_id, mes, ano): {categoria: Goal}}
-    _goals_cache: Dict[Tuple[int, int, int], Dict[str, Goal]] = {}
-    _cache_timestamps: Dict[Tuple[int, int, int], datetime] = {}
     _cache_ttl_seconds: int = 300  # 5 minutos
     
-    # Métricas de uso do sistema
-    _metrics: Dict[str, Any] = {
-        "goals_created": 0,
-        "goals_updated": 0,
-        "goals_deleted": 0,
-        "goals_queried": 0,
-        "cache_hits": 0,
-        "cache_misses": 0,
-        "alerts_sent": 0,
-        "last_reset": datetime.now()
-    }
+    def __init__(self):
+        # Cache de alertas enviados para evitar spam ((user_id, categoria, mes, ano) -> timestamp)
+        self._alert_cooldown: Dict[Tuple[int, str, int, int], datetime] = {}
+        
+        # Cache em memória para metas ativas, próprio de cada instância
+        # Estrutura: {(user_id, mes, ano): {categoria: _CachedGoal}}
+        self._goals_cache: Dict[Tuple[int, int, int], Dict[str, _CachedGoal]] = {}
+        self._cache_timestamps: Dict[Tuple[int, int, int], datetime] = {}
+        
+        # Métricas de uso: contadores brutos, que só crescem, indexados por MetricCounter,
+        # e seus valores no último reset, descontados em get_metrics
+        self._counters = _zeroed_counters()
+        self._counters_epoch = _zeroed_counters()
+        self._last_reset = datetime.now()
+        
+        # Média móvel exponencial da taxa de acerto, atualizada a cada tick
+        # (instante monotônico, cache_hits, cache_misses) do último tick
+        self._hit_rate_ewma: Optional[float] = None
+        self._hit_rate_tick: Tuple[float, int, int] = (time.monotonic(), 0, 0)
     
     def normalize_category(self, input_text: str) -> Optional[ExpenseCategory]:
         """
@@ -56,76 +342,15 @@ class GoalService:
         if not input_text:
             return None
         
-        # 1. Remover acentos e caracteres especiais
-        normalized = unicodedata.normalize('NFKD', input_text)
-        normalized = ''.join([c for c in normalized if not unicodedata.combining(c)])
-        
-        # 2. Converter para lowercase
-        normalized = normalized.lower().strip()
-        
-        # 3. Busca exata primeiro (case-insensitive)
-        for category in ExpenseCategory:
-            category_normalized = unicodedata.normalize('NFKD', category.value)
-            category_normalized = ''.join([c for c in category_normalized if not unicodedata.combining(c)])
-            category_normalized = category_normalized.lower()
-            
-            if normalized == category_normalized:
-                return category
-        
-        # 4. Busca por substring (permite "aliment" para "Alimentação")
-        # Apenas se o texto tiver pelo menos 3 caracteres
-        if len(normalized) >= 3:
-            for category in ExpenseCategory:
-                category_normalized = unicodedata.normalize('NFKD', category.value)
-                category_normalized = ''.join([c for c in category_normalized if not unicodedata.combining(c)])
-                category_normalized = category_normalized.lower()
-                
-                if normalized in category_normalized or category_normalized in normalized:
-                    return category
-        
-        # 5. Busca por similaridade (Levenshtein distance)
-        # Apenas se o texto tiver pelo menos 3 caracteres
-        if len(normalized) >= 3:
-            best_match = None
-            best_distance = float('inf')
-            
-            for category in ExpenseCategory:
-                category_normalized = unicodedata.normalize('NFKD', category.value)
-                category_normalized = ''.join([c for c in category_normalized if not unicodedata.combining(c)])
-                category_normalized = category_normalized.lower()
-                
-                distance = self._levenshtein_distance(normalized, category_normalized)
-                
-                # Aceitar se a distância for menor que 30% do tamanho da string
-                threshold = max(len(normalized), len(category_normalized)) * 0.3
-                
-                if distance < best_distance and distance <= threshold:
-                    best_distance = distance
-                    best_match = category
-            
-            return best_match
+        # 1. Remover acentos, converter para lowercase e limpar as pontas
+        normalized = _EDGE_PUNCTUATION.sub('', strip_accents(input_text).lower())
         
-        return None
+        # 2-4. Aliases, substring e similaridade, em cache por texto normalizado
+        return _resolve_normalized_category(normalized)
     
     def _levenshtein_distance(self, s1: str, s2: str) -> int:
         """Calcula a distância de Levenshtein entre duas strings"""
-        if len(s1) < len(s2):
-            return self._levenshtein_distance(s2, s1)
-        
-        if len(s2) == 0:
-            return len(s1)
-        
-        previous_row = range(len(s2) + 1)
-        for i, c1 in enumerate(s1):
-            current_row = [i + 1]
-            for j, c2 in enumerate(s2):
-                insertions = previous_row[j + 1] + 1
-                deletions = current_row[j] + 1
-                substitutions = previous_row[j] + (c1 != c2)
-                current_row.append(min(insertions, deletions, substitutions))
-            previous_row = current_row
-        
-        return previous_row[-1]
+        return _levenshtein_distance(s1, s2)
     
     def _get_cache_key(self, user_id: int, mes: int, ano: int) -> Tuple[int, int, int]:
         """Gera chave de cache para metas de um período"""
@@ -151,43 +376,88 @@ class GoalService:
     def _update_cache(self, user_id: int, mes: int, ano: int, goals: List[Goal]):
         """Atualiza cache com lista de metas"""
         cache_key = self._get_cache_key(user_id, mes, ano)
-        self._goals_cache[cache_key] = {goal.categoria: goal for goal in goals}
+        self._goals_cache[cache_key] = {
+            goal.categoria: _CachedGoal(goal.id, goal.categoria, goal.valor_meta)
+            for goal in goals
+        }
         self._cache_timestamps[cache_key] = datetime.now()
         logger.debug(f"💾 Cache atualizado: user={user_id}, mes={mes}, ano={ano}, metas={len(goals)}")
     
-    def get_metrics(self) -> Dict[str, Any]:
+    def get_metrics(self) -> Mapping[str, Any]:
         """
         Retorna métricas de uso do sistema de metas.
         
+        Os contadores são contados a partir do último reset. Campos derivados
+        só são calculados quando lidos.
+        
         Returns:
-            Dicionário com métricas de uso
-        """
-        uptime = (datetime.now() - self._metrics["last_reset"]).total_seconds()
-        cache_total = self._metrics["cache_hits"] + self._metrics["cache_misses"]
-        cache_hit_rate = (self._metrics["cache_hits"] / cache_total * 100) if cache_total > 0 else 0
-        
-        return {
-            **self._metrics,
-            "uptime_seconds": uptime,
-            "cache_hit_rate_percent": round(cache_hit_rate, 2),
-            "cache_size": len(self._goals_cache),
-            "active_cooldowns": len(self._alert_cooldown)
-        }
+            Mapeamento somente leitura com métricas de uso
+        """
+        self._update_hit_rate_ewma()
+        return _MetricsView(
+            counters=tuple(raw - epoch for raw, epoch in zip(self._counters, self._counters_epoch)),
+            last_reset=self._last_reset,
+            ewma=self._hit_rate_ewma,
+            cache_size=len(self._goals_cache),
+            active_cooldowns=len(self._alert_cooldown)
+        )
+    
+    def _update_hit_rate_ewma(self):
+        """Incorporar à média móvel a taxa de acerto do último intervalo, se o tick venceu"""
+        now = time.monotonic()
+        tick_at, hits_at, misses_at = self._hit_rate_tick
+        if now - tick_at < _HIT_RATE_EWMA_TICK_SECONDS:
+            return
+        
+        hits = self._counters[MetricCounter.CACHE_HITS]
+        misses = self._counters[MetricCounter.CACHE_MISSES]
+        self._hit_rate_tick = (now, hits, misses)
+        interval_total = (hits - hits_at) + (misses - misses_at)
+        # Intervalo sem consultas não diz nada sobre a tendência
+        if interval_total == 0:
+            return
+        
+        interval_rate = (hits - hits_at) / interval_total * 100
+        if self._hit_rate_ewma is None:
+            self._hit_rate_ewma = interval_rate
+        else:
+            self._hit_rate_ewma += _HIT_RATE_EWMA_ALPHA * (interval_rate - self._hit_rate_ewma)
+    
+    def get_raw_counters(self) -> Tuple[int, ...]:
+        """
+        Contadores de uso desde a criação do serviço, sem descontar resets.
+        
+        Returns:
+            Tupla com os contadores, indexada por MetricCounter, que nunca diminuem
+        """
+        return tuple(self._counters)
     
     def reset_metrics(self):
-        """Reseta as métricas de uso"""
-        self._metrics = {
-            "goals_created": 0,
-            "goals_updated": 0,
-            "goals_deleted": 0,
-            "goals_queried": 0,
-            "cache_hits": 0,
-            "cache_misses": 0,
-            "alerts_sent": 0,
-            "last_reset": datetime.now()
-        }
+        """Reseta as métricas de uso, sem zerar os contadores brutos"""
+        self._counters_epoch = array('q', self._counters)
+        self._last_reset = datetime.now()
+        self._hit_rate_ewma = None
+        self._hit_rate_tick = (
+            time.monotonic(),
+            self._counters[MetricCounter.CACHE_HITS],
+            self._counters[MetricCounter.CACHE_MISSES]
+        )
         logger.info("📊 Métricas resetadas")
     
+    @staticmethod
+    def get_cleanup_cutoff(months_to_keep: int = 12) -> Tuple[int, int]:
+        """
+        Período (ano, mês) mais antigo mantido por uma limpeza.
+        
+        Args:
+            months_to_keep: Número de meses de histórico a manter
+            
+        Returns:
+            Tupla (ano, mês); metas de períodos anteriores são removíveis
+        """
+        cutoff_date = datetime.now() - timedelta(days=months_to_keep * 30)
+        return cutoff_date.year, cutoff_date.month
+    
     async def cleanup_old_goals(self, months_to_keep: int = 12) -> int:
         """
         Remove metas antigas do banco de dados (opcional).
@@ -198,42 +468,119 @@ class GoalService:
         Returns:
             Número de metas removidas
         """
+        cutoff_year, cutoff_month = self.get_cleanup_cutoff(months_to_keep)
+        logger.info(f"🧹 Iniciando limpeza de metas antigas (antes de {cutoff_month}/{cutoff_year})")
+        
+        removed = await self.cleanup_old_goals_range(None, (cutoff_year, cutoff_month))
+        if removed is None:
+            return 0
+        if removed == 0:
+            logger.info("ℹ️ Nenhuma meta antiga para limpar")
+        return removed
+    
+    async def count_old_goals_range(
+        self,
+        start: Optional[Tuple[int, int]],
+        end: Tuple[int, int]
+    ) -> int:
+        """
+        Conta as metas dos períodos (ano, mês) em [start, end), sem alterar nada.
+        
+        Args:
+            start: Primeiro período contado, ou None para não ter limite inferior
+            end: Primeiro período não contado
+            
+        Returns:
+            Número de metas no intervalo
+        """
+        condition = _period_range_condition(start, end)
+        
         try:
-            cutoff_date = datetime.now() - timedelta(days=months_to_keep * 30)
-            cutoff_year = cutoff_date.year
-            cutoff_month = cutoff_date.month
+            async with db_session() as db:
+                result = await db.execute(select(func.count(Goal.id)).where(condition))
+                return result.scalar() or 0
+                
+        except Exception as e:
+            logger.error(f"❌ Erro ao contar metas antigas: {e}", exc_info=True)
+            return 0
+    
+    async def get_cleanup_watermark(self) -> Optional[Tuple[int, int]]:
+        """
+        Período (ano, mês) até onde a limpeza em janelas já removeu as metas.
+        
+        Returns:
+            Tupla (ano, mês), ou None se nenhuma limpeza em janelas foi concluída
+        """
+        try:
+            async with db_session() as db:
+                result = await db.execute(
+                    select(CleanupWatermark.ano, CleanupWatermark.mes).where(
+                        CleanupWatermark.name == _GOALS_WATERMARK
+                    )
+                )
+                row = result.first()
+                return (row.ano, row.mes) if row else None
+                
+        except Exception as e:
+            logger.error(f"❌ Erro ao ler marca d'água da limpeza: {e}", exc_info=True)
+            return None
+    
+    async def set_cleanup_watermark(self, period: Tuple[int, int]) -> bool:
+        """
+        Registra que todas as metas anteriores ao período (ano, mês) foram removidas.
+        
+        Args:
+            period: Primeiro período ainda não limpo
             
-            logger.info(f"🧹 Iniciando limpeza de metas antigas (antes de {cutoff_month}/{cutoff_year})")
+        Returns:
+            True se registrado com sucesso
+        """
+        try:
+            async with db_session() as db:
+                await _store_watermark(db, period)
+                await db.commit()
+                return True
+                
+        except Exception as e:
+            logger.error(f"❌ Erro ao registrar marca d'água da limpeza: {e}", exc_info=True)
+            return False
+    
+    async def cleanup_old_goals_range(
+        self,
+        start: Optional[Tuple[int, int]],
+        end: Tuple[int, int],
+        advance_watermark: bool = False
+    ) -> Optional[int]:
+        """
+        Remove as metas dos períodos (ano, mês) em [start, end), em uma transação.
+        
+        Args:
+            start: Primeiro período removido, ou None para não ter limite inferior
+            end: Primeiro período mantido
+            advance_watermark: Se True e houver metas a remover, a marca d'água passa
+                a end na mesma transação; janelas vazias não gravam nada
             
-            async for db in get_db_session():
+        Returns:
+            Número de metas removidas, ou None se a remoção falhou
+        """
+        condition = _period_range_condition(start, end)
+        
+        try:
+            async with db_session() as db:
                 # Contar metas que serão removidas
                 count_result = await db.execute(
-                    select(func.count(Goal.id)).where(
-                        and_(
-                            Goal.ano < cutoff_year,
-                        ) | and_(
-                            Goal.ano == cutoff_year,
-                            Goal.mes < cutoff_month
-                        )
-                    )
+                    select(func.count(Goal.id)).where(condition)
                 )
                 count = count_result.scalar() or 0
                 
+                # Janelas vazias são comuns na limpeza em lotes: sem log nem commit
                 if count == 0:
-                    logger.info("ℹ️ Nenhuma meta antiga para limpar")
                     return 0
                 
                 # Remover metas antigas
-                await db.execute(
-                    delete(Goal).where(
-                        and_(
-                            Goal.ano < cutoff_year,
-                        ) | and_(
-                            Goal.ano == cutoff_year,
-                            Goal.mes < cutoff_month
-                        )
-                    )
-                )
+                await db.execute(delete(Goal).where(condition))
+                if advance_watermark:
+                    await _store_watermark(db, end)
                 await db.commit()
                 
                 logger.info(f"✅ {count} meta(s) antiga(s) removida(s)")
@@ -246,7 +593,7 @@ class GoalService:
                 
         except Exception as e:
             logger.error(f"❌ Erro ao limpar metas antigas: {e}", exc_info=True)
-            return 0
+            return None
     
     def validate_category(self, categoria: str) -> bool:
         """
@@ -291,32 +638,10 @@ class GoalService:
             ValueError: Se os parâmetros forem inválidos
         """
         # Validações de entrada
-        if not isinstance(user_id, int) or user_id <= 0:
-            logger.error(f"❌ user_id inválido: {user_id}")
-            raise ValueError(f"user_id deve ser um inteiro positivo: {user_id}")
-        
-        if not isinstance(categoria, ExpenseCategory):
-            logger.error(f"❌ Categoria inválida: {categoria}")
-            raise ValueError(f"categoria deve ser um ExpenseCategory: {categoria}")
-        
-        if not isinstance(valor_meta, Decimal) or valor_meta <= 0:
-            logger.error(f"❌ valor_meta inválido: {valor_meta}")
-            raise ValueError(f"valor_meta deve ser um Decimal positivo: {valor_meta}")
-        
-        if valor_meta.is_infinite() or valor_meta.is_nan():
-            logger.error(f"❌ valor_meta especial inválido: {valor_meta}")
-            raise ValueError(f"valor_meta não pode ser infinito ou NaN: {valor_meta}")
-        
-        if not (1 <= mes <= 12):
-            logger.error(f"❌ Mês inválido: {mes}")
-            raise ValueError(f"mes deve estar entre 1 e 12: {mes}")
-        
-        if not (2020 <= ano <= 2030):
-            logger.error(f"❌ Ano inválido: {ano}")
-            raise ValueError(f"ano deve estar entre 2020 e 2030: {ano}")
+        _validate_goal_fields(user_id, categoria, valor_meta, mes, ano)
         
         try:
-            async for db in get_db_session():
+            async with db_session() as db:
                 # Verificar se já existe uma meta para esta combinação
                 result = await db.execute(
                     select(Goal).where(
@@ -339,7 +664,7 @@ class GoalService:
                     await db.refresh(existing_goal)
                     
                     # Atualizar métricas e invalidar cache
-                    self._metrics["goals_updated"] += 1
+                    self._counters[MetricCounter.GOALS_UPDATED] += 1
                     self._invalidate_cache(user_id, mes, ano)
                     
                     logger.info(
@@ -361,7 +686,7 @@ class GoalService:
                     await db.refresh(new_goal)
                     
                     # Atualizar métricas e invalidar cache
-                    self._metrics["goals_created"] += 1
+                    self._counters[MetricCounter.GOALS_CREATED] += 1
                     self._invalidate_cache(user_id, mes, ano)
                     
                     logger.info(
@@ -381,6 +706,72 @@ class GoalService:
             )
             raise
     
+    async def create_or_update_goals_bulk(self, goals: List[Dict[str, Any]]) -> int:
+        """
+        Cria ou atualiza várias metas com um único INSERT ... ON CONFLICT DO UPDATE.
+        
+        Args:
+            goals: Dicionários com user_id, categoria (ExpenseCategory), valor_meta, mes e ano.
+                Para chaves repetidas vale o último valor.
+            
+        Returns:
+            Número de metas gravadas
+            
+        Raises:
+            ValueError: Se algum dos campos for inválido
+        """
+        rows: Dict[Tuple[int, str, int, int], Dict[str, Any]] = {}
+        for goal in goals:
+            _validate_goal_fields(goal["user_id"], goal["categoria"], goal["valor_meta"], goal["mes"], goal["ano"])
+            key = (goal["user_id"], goal["categoria"].value, goal["mes"], goal["ano"])
+            rows[key] = {
+                "user_id": goal["user_id"],
+                "categoria": goal["categoria"].value,
+                "valor_meta": goal["valor_meta"],
+                "mes": goal["mes"],
+                "ano": goal["ano"]
+            }
+        
+        if not rows:
+            return 0
+        
+        try:
+            async with db_session() as db:
+                keys = list(rows)
+                updated = 0
+                for start in range(0, len(keys), _BULK_UPSERT_PAGE_SIZE):
+                    page = keys[start:start + _BULK_UPSERT_PAGE_SIZE]
+                    
+                    # Chaves já existentes, só para separar criadas de atualizadas nas métricas
+                    existing_result = await db.execute(
+                        select(func.count()).select_from(Goal).where(
+                            tuple_(Goal.user_id, Goal.categoria, Goal.mes, Goal.ano).in_(page)
+                        )
+                    )
+                    updated += existing_result.scalar()
+                    
+                    stmt = sqlite_insert(Goal).values([rows[key] for key in page])
+                    await db.execute(
+                        stmt.on_conflict_do_update(
+                            index_elements=[Goal.user_id, Goal.categoria, Goal.mes, Goal.ano],
+                            set_={"valor_meta": stmt.excluded.valor_meta, "updated_at": datetime.now()}
+                        )
+                    )
+                await db.commit()
+                
+                # Atualizar métricas e invalidar cache dos períodos afetados
+                self._counters[MetricCounter.GOALS_CREATED] += len(rows) - updated
+                self._counters[MetricCounter.GOALS_UPDATED] += updated
+                for user_id, mes, ano in {(user_id, mes, ano) for user_id, _, mes, ano in rows}:
+                    self._invalidate_cache(user_id, mes, ano)
+                
+                logger.info(f"✅ {len(rows)} meta(s) gravada(s) em lote: criadas={len(rows) - updated}, atualizadas={updated}")
+                return len(rows)
+                
+        except Exception as e:
+            logger.error(f"❌ Erro ao gravar metas em lote: {e}", exc_info=True)
+            raise
+    
     async def get_user_goals(
         self,
         user_id: int,
@@ -405,18 +796,18 @@ class GoalService:
                 ano = ano or now.year
             
             # Atualizar métrica
-            self._metrics["goals_queried"] += 1
+            self._counters[MetricCounter.GOALS_QUERIED] += 1
             
             # Verificar cache
             cache_key = self._get_cache_key(user_id, mes, ano)
             if self._is_cache_valid(cache_key):
-                self._metrics["cache_hits"] += 1
+                self._counters[MetricCounter.CACHE_HITS] += 1
                 goals = list(self._goals_cache[cache_key].values())
                 logger.debug(f"💾 Cache hit: user={user_id}, mes={mes}, ano={ano}, metas={len(goals)}")
             else:
-                self._metrics["cache_misses"] += 1
+                self._counters[MetricCounter.CACHE_MISSES] += 1
                 
-                async for db in get_db_session():
+                async with db_session() as db:
                     # Buscar todas as metas do usuário para o período
                     result = await db.execute(
                         select(Goal).where(
@@ -467,46 +858,42 @@ class GoalService:
             GoalResponse com progresso calculado ou None se não existir
         """
         try:
-            # Verificar cache primeiro
+            # Verificar cache primeiro (o cache guarda todas as metas do período)
             cache_key = self._get_cache_key(user_id, mes, ano)
-            goal = None
             
             if self._is_cache_valid(cache_key):
-                cached_goals = self._goals_cache.get(cache_key, {})
-                goal = cached_goals.get(categoria.value)
-                if goal:
-                    self._metrics["cache_hits"] += 1
-                    logger.debug(f"💾 Cache hit para meta: user={user_id}, categoria={categoria.value}")
-            
-            if not goal:
-                self._metrics["cache_misses"] += 1
+                self._counters[MetricCounter.CACHE_HITS] += 1
+                goal = self._goals_cache[cache_key].get(categoria.value)
+                logger.debug(f"💾 Cache hit para meta: user={user_id}, categoria={categoria.value}")
+            else:
+                self._counters[MetricCounter.CACHE_MISSES] += 1
                 
-                async for db in get_db_session():
-                    # Buscar a meta
-                    goal_result = await db.execute(
+                async with db_session() as db:
+                    # Buscar todas as metas do período, para as próximas consultas virem do cache
+                    result = await db.execute(
                         select(Goal).where(
                             and_(
                                 Goal.user_id == user_id,
-                                Goal.categoria == categoria.value,
                                 Goal.mes == mes,
                                 Goal.ano == ano
                             )
                         )
                     )
-                    goal = goal_result.scalar_one_or_none()
-                    
-                    if not goal:
-                        return None
+                    goals = result.scalars().all()
+                    self._update_cache(user_id, mes, ano, goals)
+                    goal = self._goals_cache[cache_key].get(categoria.value)
+            
+            if not goal:
+                return None
             
             # Calcular gastos do mês para a categoria (sempre busca do banco para dados atualizados)
             # NOTA: Não filtra por user_id pois o sistema é compartilhado entre usuários
-            async for db in get_db_session():
+            async with db_session() as db:
                 spending_result = await db.execute(
                     select(func.sum(Transaction.valor)).where(
                         and_(
                             Transaction.categoria == categoria.value,
-                            extract('month', Transaction.data_transacao) == mes,
-                            extract('year', Transaction.data_transacao) == ano,
+                            Transaction.data_transacao.between(*month_date_range(ano, mes)),
                             Transaction.status == 'processed'
                         )
                     )
@@ -514,14 +901,7 @@ class GoalService:
                 valor_gasto = spending_result.scalar() or Decimal('0')
                 
                 # Calcular percentual e status
-                progresso_percentual = float((valor_gasto / goal.valor_meta) * 100) if goal.valor_meta > 0 else 0
-                
-                if progresso_percentual >= 100:
-                    status = GoalStatus.LIMITE_EXCEDIDO
-                elif progresso_percentual >= 80:
-                    status = GoalStatus.PROXIMO_LIMITE
-                else:
-                    status = GoalStatus.DENTRO_META
+                progresso_percentual = calculate_progress_percent(valor_gasto, goal.valor_meta)
                 
                 return GoalResponse(
                     id=goal.id,
@@ -529,7 +909,7 @@ class GoalService:
                     valor_meta=goal.valor_meta,
                     valor_gasto=valor_gasto,
                     progresso_percentual=progresso_percentual,
-                    status=status,
+                    status=goal_status_for_percent(progresso_percentual),
                     mes=mes,
                     ano=ano
                 )
@@ -563,7 +943,7 @@ class GoalService:
                 f"mes={mes}, ano={ano}"
             )
             
-            async for db in get_db_session():
+            async with db_session() as db:
                 result = await db.execute(
                     select(Goal).where(
                         and_(
@@ -582,7 +962,7 @@ class GoalService:
                     await db.commit()
                     
                     # Atualizar métricas e invalidar cache
-                    self._metrics["goals_deleted"] += 1
+                    self._counters[MetricCounter.GOALS_DELETED] += 1
                     self._invalidate_cache(user_id, mes, ano)
                     
                     logger.info(
@@ -618,29 +998,25 @@ class GoalService:
         try:
             logger.info(f"🧹 Tentativa de limpeza de todas as metas: user={user_id}")
             
-            async for db in get_db_session():
-                result = await db.execute(
-                    select(Goal).where(Goal.user_id == user_id)
+            async with db_session() as db:
+                # Contar metas que serão removidas
+                count_result = await db.execute(
+                    select(func.count(Goal.id)).where(Goal.user_id == user_id)
                 )
-                goals = result.scalars().all()
-                
-                count = len(goals)
+                count = count_result.scalar() or 0
                 
                 if count == 0:
                     logger.info(f"ℹ️ Nenhuma meta para limpar: user={user_id}")
                     return 0
                 
-                # Log das metas que serão removidas
-                categorias_removidas = [goal.categoria for goal in goals]
-                logger.info(f"🗑️ Removendo {count} meta(s): user={user_id}, categorias={categorias_removidas}")
-                
-                for goal in goals:
-                    await db.delete(goal)
-                
+                # Remover com um único DELETE, sem carregar as metas
+                await db.execute(
+                    delete(Goal).where(Goal.user_id == user_id)
+                )
                 await db.commit()
                 
                 # Atualizar métricas e limpar cache do usuário
-                self._metrics["goals_deleted"] += count
+                self._counters[MetricCounter.GOALS_DELETED] += count
                 
                 # Invalidar cache para todos os períodos do usuário
                 keys_to_remove = [key for key in self._goals_cache.keys() if key[0] == user_id]
@@ -685,7 +1061,7 @@ class GoalService:
                 return None
             
             # Verificar cooldown de alertas (máximo 1 por categoria por dia)
-            cooldown_key = f"{user_id}_{categoria.value}_{mes}_{ano}"
+            cooldown_key = (user_id, categoria.value, mes, ano)
             last_alert = self._alert_cooldown.get(cooldown_key)
             
             if last_alert:
@@ -705,7 +1081,7 @@ class GoalService:
             
             # Registrar alerta enviado e atualizar métrica
             self._alert_cooldown[cooldown_key] = now
-            self._metrics["alerts_sent"] += 1
+            self._counters[MetricCounter.ALERTS_SENT] += 1
             
             return GoalAlert(
                 tipo=alert_type,
@@ -12,7 +12,7 @@ from loguru import logger
 
 from config.settings import get_settings
 from models.schemas import InterpretedTransaction, ExpenseCategory, FinancialInsights, InsightsPeriod, TranscriptionResult
-from database.sqlite_db import get_db_session
+from database.sqlite_db import db_session
 from database.models import AIPromptCache
 from sqlalchemy import select
 from openai import AsyncOpenAI
@@ -151,7 +151,7 @@ Retorne APENAS o JSON, sem texto adicional:
         try:
             message_hash = hashlib.sha256(message.encode()).hexdigest()
 
-            async for db in get_db_session():
+            async with db_session() as db:
                 result = await db.execute(
                     select(AIPromptCache).where(
                         AIPromptCache.input_hash == message_hash,
@@ -174,7 +174,7 @@ Retorne APENAS o JSON, sem texto adicional:
             message_hash = hashlib.sha256(message.encode()).hexdigest()
             expires_at = datetime.now() + timedelta(days=7)
 
-            async for db in get_db_session():
+            async with db_session() as db:
                 cache_entry = AIPromptCache(
                     input_hash=message_hash,
                     input_text=message,
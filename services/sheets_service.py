@@ -266,7 +266,7 @@ class GoogleSheetsService:
         """Sincronização inicial otimizada: SQLite → Google Sheets"""
         try:
             from services.database_service import database_service
-            from database.sqlite_db import get_db_session
+            from database.sqlite_db import db_session
             from database.models import Transaction
             from sqlalchemy import select
             import asyncio
@@ -275,7 +275,7 @@ class GoogleSheetsService:
             
             await self._clean_inconsistent_data()
             
-            async for db in get_db_session():
+            async with db_session() as db:
                 result = await db.execute(
                     select(Transaction)
                     .where(Transaction.status == 'processed')
@@ -389,10 +389,10 @@ class GoogleSheetsService:
     async def _mark_transactions_as_synced(self, transactions):
         """Marcar transações como sincronizadas no banco"""
         try:
-            from database.sqlite_db import get_db_session
+            from database.sqlite_db import db_session
             from datetime import datetime
             
-            async for db in get_db_session():
+            async with db_session() as db:
                 for transaction in transactions:
                     transaction.sheets_row_number = 999  # Valor fictício indicando sincronização
                     transaction.sheets_updated_at = datetime.now()
@@ -406,14 +406,14 @@ class GoogleSheetsService:
     async def _clean_inconsistent_data(self):
         """Limpar dados inconsistentes da planilha (dados inseridos manualmente)"""
         try:
-            from database.sqlite_db import get_db_session
+            from database.sqlite_db import db_session
             from database.models import Transaction
             from sqlalchemy import select
             import asyncio
             
             logger.info("🧹 Iniciando limpeza de dados inconsistentes...")
             
-            async for db in get_db_session():
+            async with db_session() as db:
                 result = await db.execute(
                     select(Transaction.id)
                     .where(Transaction.status == 'processed')
@@ -478,11 +478,11 @@ class GoogleSheetsService:
     async def _validate_sheet_data_integrity(self) -> dict:
         """Validar integridade dos dados na planilha"""
         try:
-            from database.sqlite_db import get_db_session
+            from database.sqlite_db import db_session
             from database.models import Transaction
             from sqlalchemy import select
             
-            async for db in get_db_session():
+            async with db_session() as db:
                 result = await db.execute(
                     select(Transaction.id)
                     .where(Transaction.status == 'processed')
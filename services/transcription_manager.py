@@ -7,6 +7,11 @@ from datetime import datetime, timedelta
 from typing import Dict, Optional, Callable, Awaitable
 from models.schemas import PendingTranscription
 
+# Como no loop do asyncio com timers cancelados: o dicionário só é reconstruído de
+# uma vez se tiver mais que o mínimo de entradas e a fração expirada passar do limite
+_MIN_PENDING_TRANSCRIPTIONS = 100
+_MIN_EXPIRED_TRANSCRIPTIONS_FRACTION = 0.25
+
 
 class TranscriptionManager:
     """Gerenciador de transcrições pendentes em memória"""
@@ -32,26 +37,7 @@ class TranscriptionManager:
         """Limpar transcrições expiradas periodicamente"""
         while True:
             try:
-                now = datetime.now()
-                expired_transcriptions = [
-                    transcription for transcription in self._pending_transcriptions.values()
-                    if transcription.expires_at <= now
-                ]
-                
-                # Notificar usuários sobre expiração antes de remover
-                for transcription in expired_transcriptions:
-                    if self._timeout_notification_callback:
-                        try:
-                            await self._timeout_notification_callback(transcription)
-                        except Exception as e:
-                            print(f"Erro ao notificar timeout para usuário {transcription.user_id}: {e}")
-                    
-                    # Remover transcrição expirada
-                    if transcription.id in self._pending_transcriptions:
-                        del self._pending_transcriptions[transcription.id]
-                
-                if expired_transcriptions:
-                    print(f"Limpeza automática: {len(expired_transcriptions)} transcrições expiradas removidas")
+                await self._sweep_expired()
                 
                 # Aguardar 1 minuto antes da próxima limpeza
                 await asyncio.sleep(60)
@@ -60,6 +46,41 @@ class TranscriptionManager:
                 print(f"Erro na limpeza automática de transcrições: {e}")
                 await asyncio.sleep(60)
     
+    async def _sweep_expired(self) -> int:
+        """Notificar e remover as transcrições expiradas, retornando quantas foram removidas"""
+        now = datetime.now()
+        expired_transcriptions = [
+            transcription for transcription in self._pending_transcriptions.values()
+            if transcription.expires_at <= now
+        ]
+        
+        # Notificar usuários sobre expiração antes de remover
+        for transcription in expired_transcriptions:
+            if self._timeout_notification_callback:
+                try:
+                    await self._timeout_notification_callback(transcription)
+                except Exception as e:
+                    print(f"Erro ao notificar timeout para usuário {transcription.user_id}: {e}")
+        
+        # Remover transcrições expiradas: reconstruir o dicionário quando
+        # uma fração grande expirou evita muitas remoções individuais
+        expired_ids = {transcription.id for transcription in expired_transcriptions}
+        pending_count = len(self._pending_transcriptions)
+        if (pending_count > _MIN_PENDING_TRANSCRIPTIONS and
+                len(expired_ids) > _MIN_EXPIRED_TRANSCRIPTIONS_FRACTION * pending_count):
+            self._pending_transcriptions = {
+                transcription_id: transcription
+                for transcription_id, transcription in self._pending_transcriptions.items()
+                if transcription_id not in expired_ids
+            }
+        else:
+            for transcription_id in expired_ids:
+                self._pending_transcriptions.pop(transcription_id, None)
+        
+        if expired_transcriptions:
+            print(f"Limpeza automática: {len(expired_transcriptions)} transcrições expiradas removidas")
+        return len(expired_ids)
+    
     def add_pending_transcription(self, user_id: int, message_id: int, transcribed_text: str, timeout_minutes: int = 1) -> str:
         """Adicionar transcrição pendente"""
         # Tentar iniciar cleanup se ainda não foi iniciado
@@ -0,0 +1,222 @@
+"""
+Fixtures compartilhadas pelos testes
+"""
+
+import asyncio
+import os
+import pytest
+import pytest_asyncio
+from datetime import datetime
+from hypothesis import Phase, settings
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import database.sqlite_db as sqlite_db
+from database.models import Base
+from services.goal_service import GoalService, goal_service as _goal_service
+from utils.error_handler import AudioErrorHandler
+
+
+# Perfil de CI: sem banco de exemplos em disco, exemplos determinísticos e sem deadline
+settings.register_profile("ci", max_examples=25, database=None, derandomize=True, deadline=None)
+# Perfil local rápido: roda só os casos de @example, sem gerar dados
+settings.register_profile("fast", phases=[Phase.explicit], database=None, deadline=None)
+settings.load_profile(os.getenv("HYPOTHESIS_PROFILE", "default"))
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _warmup():
+    """Exercita normalização de categorias e categorização de erros uma vez por sessão"""
+    _goal_service.normalize_category("alimentacao")
+    AudioErrorHandler.categorize_error(Exception("connection timeout"))
+
+
+@pytest.fixture(scope="session")
+def goal_service():
+    """Instância global do GoalService, com tabelas de categorias já construídas"""
+    return _goal_service
+
+
+@pytest.fixture(scope="session")
+def sqlite_engine():
+    """
+    Engine SQLite síncrono em memória, compartilhado pela sessão de testes.
+    
+    Schema e constraint única são criados uma única vez; os testes de propriedade
+    desfazem cada exemplo com rollback em vez de recriar o engine.
+    
+    O banco nomeado com cache compartilhado é visto por todas as conexões do
+    engine, e o nome por worker do pytest-xdist evita que workers o dividam.
+    """
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+    # StaticPool: todas as sessões reutilizam a mesma conexão, sem checkouts por thread
+    engine = create_engine(
+        f'sqlite:///file:goals_{worker}?mode=memory&cache=shared&uri=true',
+        poolclass=StaticPool,
+        connect_args={'check_same_thread': False}
+    )
+    
+    # O pysqlite adia o BEGIN e quebra SAVEPOINTs; transações passam a ser emitidas pelo SQLAlchemy
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+    
+    # Banco descartável: sem fsync nem journal em disco
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA journal_mode=MEMORY")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+    
+    @event.listens_for(engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+    
+    # A constraint UNIQUE de metas faz parte do modelo e é criada pelo create_all
+    Base.metadata.create_all(engine)
+    
+    yield engine
+    
+    engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def in_memory_sqlite(monkeypatch):
+    """
+    Banco SQLite em memória com o mesmo schema do banco real.
+
+    Substitui a fábrica de sessões usada por db_session e get_db_session, de modo que
+    goal_service, database_service e os próprios testes usem o banco em
+    memória sem tocar no arquivo em disco.
+    
+    Cada teste (e cada worker do pytest-xdist) tem o seu próprio banco, então
+    os testes de integração rodam em paralelo sem precisar de um banco por worker.
+    """
+    # StaticPool mantém uma única conexão, necessária para compartilhar o :memory:
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        poolclass=StaticPool
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    _use_session_factory(monkeypatch, engine)
+
+    yield engine
+
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture(scope="module")
+async def shared_async_engine():
+    """
+    Engine SQLite assíncrono em memória, criado uma vez por módulo.
+    
+    Exige que o módulo sobrescreva event_loop com escopo de módulo: o engine
+    não pode ser usado em um loop diferente daquele em que foi criado.
+    """
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        poolclass=StaticPool
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield engine
+
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def shared_in_memory_sqlite(shared_async_engine, monkeypatch):
+    """
+    Alternativa a in_memory_sqlite que reaproveita o engine do módulo.
+    
+    Cada teste começa com as tabelas vazias. Não usa SAVEPOINT por teste: os
+    serviços fazem commit nas próprias sessões, sobre a mesma conexão.
+    """
+    async with shared_async_engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            await conn.execute(table.delete())
+
+    _use_session_factory(monkeypatch, shared_async_engine)
+
+    # O loop fecha os geradores abandonados em tarefas próprias, que com o loop
+    # compartilhado podem rodar já no teste seguinte; guardar as de get_db_session
+    loop = asyncio.get_running_loop()
+    finalize = loop._asyncgen_finalizer_hook
+    session_closes = []
+
+    def track_session_close(agen):
+        if agen.ag_code is not sqlite_db.get_db_session.__code__:
+            return finalize(agen)
+        loop._asyncgens.discard(agen)
+        session_closes.append(loop.create_task(agen.aclose()))
+
+    monkeypatch.setattr(loop, "_asyncgen_finalizer_hook", track_session_close)
+
+    yield shared_async_engine
+
+    # Esperar só o fechamento das sessões abertas durante o teste
+    await asyncio.gather(*session_closes, return_exceptions=True)
+
+
+def _use_session_factory(monkeypatch, engine):
+    """Apontar db_session e get_db_session para o engine dado e zerar os caches da instância global"""
+    session_factory = async_sessionmaker(
+        engine,
+        class_=AsyncSession,
+        expire_on_commit=False
+    )
+    monkeypatch.setattr(sqlite_db, "AsyncSessionLocal", session_factory)
+
+    # Caches da instância global guardariam metas de outro banco
+    _goal_service._goals_cache.clear()
+    _goal_service._cache_timestamps.clear()
+    _goal_service._alert_cooldown.clear()
+
+
+@pytest_asyncio.fixture
+async def fresh_goal_service(in_memory_sqlite):
+    """
+    GoalService novo sobre o banco em memória do teste.
+    
+    Cache, cooldowns e métricas são da instância, então testes que os inspecionam
+    não interferem entre si nem com a instância global, e dispensam limpeza.
+    """
+    return GoalService()
+
+
+@pytest.fixture(scope="module")
+def now():
+    """
+    Instante lido uma única vez por módulo.
+    
+    Não é uma data fixa: goal_service usa datetime.now() para o mês corrente
+    nos alertas, então as metas dos testes precisam cair no mês real.
+    """
+    return datetime.now()
+
+
+@pytest_asyncio.fixture
+async def seeded_goal(request, in_memory_sqlite, now):
+    """
+    Meta do mês corrente criada antes do teste.
+    
+    Parametrizada indiretamente com (user_id, categoria, valor_meta); entrega
+    (user_id, categoria, valor_meta, mes, ano). Não há limpeza por meta: o banco em
+    memória de in_memory_sqlite é descartado inteiro ao fim do teste.
+    """
+    user_id, categoria, valor_meta = request.param
+    mes, ano = now.month, now.year
+    await _goal_service.create_or_update_goal(
+        user_id=user_id,
+        categoria=categoria,
+        valor_meta=valor_meta,
+        mes=mes,
+        ano=ano
+    )
+    return user_id, categoria, valor_meta, mes, ano
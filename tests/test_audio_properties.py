@@ -58,6 +58,17 @@ def interpreted_transaction_strategy(draw):
     )
 
 
+# Estratégias compartilhadas pelos testes de timeout (construídas uma única vez)
+USER_ID_STRATEGY = st.integers(min_value=1, max_value=999999999)
+TRANSCRIBED_TEXT_STRATEGY = st.text(min_size=10, max_size=200)
+TIMEOUT_MINUTES_STRATEGY = st.integers(min_value=1, max_value=10)
+TIMEOUT_SCENARIO_STRATEGY = st.tuples(
+    USER_ID_STRATEGY,  # user_id
+    TRANSCRIBED_TEXT_STRATEGY,  # transcribed_text
+    TIMEOUT_MINUTES_STRATEGY  # timeout_minutes
+)
+
+
 class TestAudioSourceMarking:
     """**Feature: transcricao-audio, Property 7: Marcação de origem**"""
     
@@ -2052,17 +2063,7 @@ class TestTranscriptionTimeout:
         self.manager._pending_transcriptions.clear()
         self.manager._cleanup_started = False
     
-    @given(
-        timeout_scenarios=st.lists(
-            st.tuples(
-                st.integers(min_value=1, max_value=999999999),  # user_id
-                st.text(min_size=10, max_size=200),  # transcribed_text
-                st.integers(min_value=1, max_value=10)  # timeout_minutes
-            ),
-            min_size=1,
-            max_size=5
-        )
-    )
+    @given(timeout_scenarios=st.lists(TIMEOUT_SCENARIO_STRATEGY, min_size=1, max_size=5))
     def test_automatic_timeout_property(self, timeout_scenarios):
         """
         **Feature: transcricao-audio, Property 6: Timeout automático**
@@ -2119,8 +2120,8 @@ class TestTranscriptionTimeout:
         asyncio.run(test_timeout_logic())
     
     @given(
-        user_id=st.integers(min_value=1, max_value=999999999),
-        transcribed_text=st.text(min_size=10, max_size=200)
+        user_id=USER_ID_STRATEGY,
+        transcribed_text=TRANSCRIBED_TEXT_STRATEGY
     )
     def test_default_timeout_property(self, user_id, transcribed_text):
         """
@@ -2154,7 +2155,7 @@ class TestTranscriptionTimeout:
     @given(
         multiple_users=st.lists(
             st.tuples(
-                st.integers(min_value=1, max_value=999999999),  # user_id
+                USER_ID_STRATEGY,  # user_id
                 st.text(min_size=10, max_size=100),  # transcribed_text
                 st.integers(min_value=1, max_value=8)  # timeout_minutes
             ),
@@ -2219,7 +2220,7 @@ class TestTranscriptionTimeout:
     @given(
         cleanup_scenarios=st.lists(
             st.tuples(
-                st.integers(min_value=1, max_value=999999999),  # user_id
+                USER_ID_STRATEGY,  # user_id
                 st.text(min_size=5, max_size=50),  # transcribed_text
                 st.booleans()  # should_expire
             ),
@@ -2300,10 +2301,40 @@ class TestTranscriptionTimeout:
         
         asyncio.run(test_cleanup())
     
+    @pytest.mark.parametrize("total, expired, rebuilt", [
+        (200, 100, True),   # Muitas entradas e mais de 25% expiradas: reconstrói
+        (200, 10, False),   # Poucas expiradas: remove uma a uma
+        (8, 6, False),      # Abaixo do mínimo de entradas: remove uma a uma
+    ])
+    def test_cleanup_sweep_removes_only_expired(self, total, expired, rebuilt):
+        """Uma varredura da limpeza automática remove só as expiradas, em qualquer ramo"""
+        import asyncio
+        from datetime import datetime, timedelta
+        
+        ids = [
+            self.manager.add_pending_transcription(
+                user_id=index + 1,
+                message_id=index + 5000,
+                transcribed_text="texto transcrito",
+                timeout_minutes=10
+            )
+            for index in range(total)
+        ]
+        expired_ids = set(ids[:expired])
+        for transcription_id in expired_ids:
+            self.manager._pending_transcriptions[transcription_id].expires_at = datetime.now() - timedelta(seconds=1)
+        pending_before = self.manager._pending_transcriptions
+        
+        removed = asyncio.run(self.manager._sweep_expired())
+        
+        assert removed == expired
+        assert set(self.manager._pending_transcriptions) == set(ids) - expired_ids
+        assert (self.manager._pending_transcriptions is not pending_before) == rebuilt
+    
     @given(
         notification_scenarios=st.lists(
             st.tuples(
-                st.integers(min_value=1, max_value=999999999),  # user_id
+                USER_ID_STRATEGY,  # user_id
                 st.text(min_size=10, max_size=100)  # transcribed_text
             ),
             min_size=1,
@@ -8,7 +8,7 @@ from datetime import date
 
 from models.schemas import InterpretedTransaction, ExpenseCategory
 from services.openai_service import OpenAIService
-from utils.helpers import extract_numbers, format_currency, get_month_name
+from utils.helpers import extract_numbers, format_currency, get_month_name, month_date_range, year_date_range
 
 
 class TestSchemas:
@@ -64,6 +64,12 @@ class TestUtils:
         assert get_month_name(12) == "Dezembro"
         assert get_month_name(13) == "Janeiro"
 
+    def test_month_date_range(self):
+        """Testar intervalo de datas do mês"""
+        assert month_date_range(2024, 2) == (date(2024, 2, 1), date(2024, 2, 29))
+        assert month_date_range(2025, 12) == (date(2025, 12, 1), date(2025, 12, 31))
+        assert year_date_range(2025) == (date(2025, 1, 1), date(2025, 12, 31))
+
 
 @pytest.mark.asyncio
 class TestServices:
@@ -10,8 +10,10 @@ from services.database_service import database_service
 from database.sqlite_db import get_db_session
 from database.models import Goal, Transaction
 
+pytestmark = pytest.mark.asyncio
 
-@pytest.mark.asyncio
+
+@pytest.mark.usefixtures("in_memory_sqlite")
 class TestDatabaseServiceGoalSupport:
     """Testes para métodos de suporte a metas no DatabaseService"""
 
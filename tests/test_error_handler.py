@@ -9,89 +9,92 @@ from utils.error_handler import AudioErrorHandler, AudioProcessingMetrics
 class TestAudioErrorHandler:
     """Testes para o AudioErrorHandler"""
     
-    def test_categorize_network_errors(self):
-        """Testar categorização de erros de rede"""
-        network_errors = [
-            Exception("Connection timeout"),
-            Exception("Network unreachable"),
-            Exception("DNS resolution failed"),
-            Exception("Socket connection refused")
+    @pytest.fixture(scope="class")
+    def recoverable_errors(self):
+        """Erros que podem ser tentados novamente"""
+        return [
+            Exception("Network timeout"),
+            Exception("Rate limit exceeded"),
+            Exception("Disk space insufficient")
         ]
-        
-        for error in network_errors:
-            category = AudioErrorHandler.categorize_error(error)
-            assert category == 'network', f"Erro de rede não categorizado corretamente: {error}"
     
-    def test_categorize_file_format_errors(self):
-        """Testar categorização de erros de formato"""
-        format_errors = [
-            Exception("Unsupported format"),
-            Exception("Invalid MIME type"),
-            Exception("File extension not supported"),
-            Exception("Format not recognized")
+    @pytest.fixture(scope="class")
+    def non_recoverable_errors(self):
+        """Erros que não devem ser tentados novamente"""
+        return [
+            Exception("Invalid format"),
+            Exception("File corrupted"),
+            Exception("Permission denied")
         ]
-        
-        for error in format_errors:
-            category = AudioErrorHandler.categorize_error(error)
-            assert category == 'file_format', f"Erro de formato não categorizado corretamente: {error}"
     
-    def test_categorize_file_size_errors(self):
+    @pytest.fixture(scope="class")
+    def network_error(self):
+        return Exception("Network timeout")
+    
+    @pytest.fixture(scope="class")
+    def api_error(self):
+        return Exception("Rate limit exceeded")
+    
+    @pytest.mark.parametrize("message", [
+        "Connection timeout",
+        "Network unreachable",
+        "DNS resolution failed",
+        "Socket connection refused"
+    ])
+    def test_categorize_network_errors(self, message):
+        """Testar categorização de erros de rede"""
+        error = Exception(message)
+        category = AudioErrorHandler.categorize_error(error)
+        assert category == 'network', f"Erro de rede não categorizado corretamente: {error}"
+    
+    @pytest.mark.parametrize("message", [
+        "Unsupported format",
+        "Invalid MIME type",
+        "File extension not supported",
+        "Format not recognized"
+    ])
+    def test_categorize_file_format_errors(self, message):
+        """Testar categorização de erros de formato"""
+        error = Exception(message)
+        category = AudioErrorHandler.categorize_error(error)
+        assert category == 'file_format', f"Erro de formato não categorizado corretamente: {error}"
+    
+    @pytest.mark.parametrize("message", [
+        "File too large",
+        "Size limit exceeded",
+        "Maximum file size reached",
+        "File is too big"
+    ])
+    def test_categorize_file_size_errors(self, message):
         """Testar categorização de erros de tamanho"""
-        size_errors = [
-            Exception("File too large"),
-            Exception("Size limit exceeded"),
-            Exception("Maximum file size reached"),
-            Exception("File is too big")
-        ]
-        
-        for error in size_errors:
-            category = AudioErrorHandler.categorize_error(error)
-            assert category == 'file_size', f"Erro de tamanho não categorizado corretamente: {error}"
+        error = Exception(message)
+        category = AudioErrorHandler.categorize_error(error)
+        assert category == 'file_size', f"Erro de tamanho não categorizado corretamente: {error}"
     
-    def test_get_user_friendly_messages(self):
+    @pytest.mark.parametrize("error_message,expected_keyword", [
+        ("Connection timeout", "conexão"),
+        ("Unsupported format", "formato"),
+        ("File too large", "grande"),
+        ("Rate limit exceeded", "limite")
+    ])
+    def test_get_user_friendly_messages(self, error_message, expected_keyword):
         """Testar mensagens amigáveis para usuários"""
-        test_cases = [
-            (Exception("Connection timeout"), "conexão"),
-            (Exception("Unsupported format"), "formato"),
-            (Exception("File too large"), "grande"),
-            (Exception("Rate limit exceeded"), "limite")
-        ]
-        
-        for error, expected_keyword in test_cases:
-            message = AudioErrorHandler.get_user_friendly_message(error)
-            assert expected_keyword.lower() in message.lower(), \
-                f"Mensagem não contém palavra-chave esperada '{expected_keyword}': {message}"
+        message = AudioErrorHandler.get_user_friendly_message(Exception(error_message))
+        assert expected_keyword.lower() in message.lower(), \
+            f"Mensagem não contém palavra-chave esperada '{expected_keyword}': {message}"
     
-    def test_is_recoverable_error(self):
+    def test_is_recoverable_error(self, recoverable_errors, non_recoverable_errors):
         """Testar identificação de erros recuperáveis"""
-        recoverable_errors = [
-            Exception("Network timeout"),
-            Exception("Rate limit exceeded"),
-            Exception("Disk space insufficient")
-        ]
-        
-        non_recoverable_errors = [
-            Exception("Invalid format"),
-            Exception("File corrupted"),
-            Exception("Permission denied")
-        ]
-        
         for error in recoverable_errors:
-            category = AudioErrorHandler.categorize_error(error)
-            is_recoverable = AudioErrorHandler.is_recoverable_error(error)
-            print(f"Error: {error}, Category: {category}, Recoverable: {is_recoverable}")
-            assert is_recoverable, \
-                f"Erro deveria ser recuperável: {error} (categoria: {category})"
+            assert AudioErrorHandler.is_recoverable_error(error), \
+                f"Erro deveria ser recuperável: {error} (categoria: {AudioErrorHandler.categorize_error(error)})"
         
         for error in non_recoverable_errors:
             assert not AudioErrorHandler.is_recoverable_error(error), \
                 f"Erro não deveria ser recuperável: {error}"
     
-    def test_get_retry_delay(self):
+    def test_get_retry_delay(self, network_error, api_error):
         """Testar cálculo de delay para retry"""
-        network_error = Exception("Network timeout")
-        api_error = Exception("Rate limit exceeded")
-        
         # Testar que delay aumenta com tentativas
         delay1 = AudioErrorHandler.get_retry_delay(network_error, 0)
         delay2 = AudioErrorHandler.get_retry_delay(network_error, 1)
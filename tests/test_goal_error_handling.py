@@ -6,14 +6,23 @@ Testes unitários para tratamento de erros do sistema de metas financeiras
 import pytest
 from decimal import Decimal, InvalidOperation
 from datetime import datetime
-from services.goal_service import goal_service
 from models.schemas import ExpenseCategory
+from utils.helpers import calculate_progress_percent, is_valid_month, parse_money, strip_accents
+
+
+def _is_valid_money(text: str) -> bool:
+    """Verificar se o texto pode ser convertido em valor monetário"""
+    try:
+        parse_money(text)
+        return True
+    except (InvalidOperation, ValueError, AttributeError):
+        return False
 
 
 class TestGoalCommandValidation:
     """Testes para validação de comandos de meta"""
     
-    def test_invalid_category_input(self):
+    def test_invalid_category_input(self, goal_service):
         """Testar validação de entrada de categoria inválida"""
         invalid_categories = [
             "InvalidCategory",
@@ -32,27 +41,25 @@ class TestGoalCommandValidation:
             if result is None:
                 assert result is None, f"Categoria inválida deveria retornar None: {invalid_cat}"
     
-    def test_valid_category_variations(self):
+    @pytest.mark.parametrize("input_text,expected_category", [
+        ("alimentação", ExpenseCategory.ALIMENTACAO),
+        ("ALIMENTAÇÃO", ExpenseCategory.ALIMENTACAO),
+        ("Alimentação", ExpenseCategory.ALIMENTACAO),
+        ("alimentacao", ExpenseCategory.ALIMENTACAO),
+        ("aliment", ExpenseCategory.ALIMENTACAO),  # Substring
+        ("transporte", ExpenseCategory.TRANSPORTE),
+        ("TRANSPORTE", ExpenseCategory.TRANSPORTE),
+        ("saude", ExpenseCategory.SAUDE),
+        ("saúde", ExpenseCategory.SAUDE),
+        ("SAÚDE", ExpenseCategory.SAUDE),
+    ])
+    def test_valid_category_variations(self, goal_service, input_text, expected_category):
         """Testar normalização de variações válidas de categoria"""
-        test_cases = [
-            ("alimentação", ExpenseCategory.ALIMENTACAO),
-            ("ALIMENTAÇÃO", ExpenseCategory.ALIMENTACAO),
-            ("Alimentação", ExpenseCategory.ALIMENTACAO),
-            ("alimentacao", ExpenseCategory.ALIMENTACAO),
-            ("aliment", ExpenseCategory.ALIMENTACAO),  # Substring
-            ("transporte", ExpenseCategory.TRANSPORTE),
-            ("TRANSPORTE", ExpenseCategory.TRANSPORTE),
-            ("saude", ExpenseCategory.SAUDE),
-            ("saúde", ExpenseCategory.SAUDE),
-            ("SAÚDE", ExpenseCategory.SAUDE),
-        ]
-        
-        for input_text, expected_category in test_cases:
-            result = goal_service.normalize_category(input_text)
-            assert result == expected_category, \
-                f"Normalização falhou para '{input_text}': esperado {expected_category}, obtido {result}"
+        result = goal_service.normalize_category(input_text)
+        assert result == expected_category, \
+            f"Normalização falhou para '{input_text}': esperado {expected_category}, obtido {result}"
     
-    def test_category_with_special_characters(self):
+    def test_category_with_special_characters(self, goal_service):
         """Testar normalização com caracteres especiais"""
         test_cases = [
             "Alimentação!!!",
@@ -68,15 +75,13 @@ class TestGoalCommandValidation:
             assert result is not None or len(input_text.strip("!?@. ")) >= 3, \
                 f"Deveria normalizar ou rejeitar: {input_text}"
     
-    def test_empty_and_whitespace_categories(self):
+    @pytest.mark.parametrize("empty_input", ["", "   ", "\t", "\n", "  \t\n  "])
+    def test_empty_and_whitespace_categories(self, goal_service, empty_input):
         """Testar categorias vazias e com apenas espaços"""
-        empty_inputs = ["", "   ", "\t", "\n", "  \t\n  "]
-        
-        for empty_input in empty_inputs:
-            result = goal_service.normalize_category(empty_input)
-            assert result is None, f"Entrada vazia deveria retornar None: '{empty_input}'"
+        result = goal_service.normalize_category(empty_input)
+        assert result is None, f"Entrada vazia deveria retornar None: '{empty_input}'"
     
-    def test_category_similarity_threshold(self):
+    def test_category_similarity_threshold(self, goal_service):
         """Testar limite de similaridade para categorias"""
         # Testes de similaridade - devem ser aceitos
         similar_valid = [
@@ -92,56 +97,51 @@ class TestGoalCommandValidation:
                 assert result == expected, \
                     f"Se normalizado, deveria ser {expected}: {input_text} -> {result}"
     
-    def test_very_short_category_input(self):
+    @pytest.mark.parametrize("short_input", ["a", "ab", "x", "12"])
+    def test_very_short_category_input(self, goal_service, short_input):
         """Testar entradas muito curtas"""
-        short_inputs = ["a", "ab", "x", "12"]
-        
-        for short_input in short_inputs:
-            result = goal_service.normalize_category(short_input)
-            # Entradas muito curtas não devem ser normalizadas
-            assert result is None, f"Entrada muito curta deveria retornar None: {short_input}"
+        result = goal_service.normalize_category(short_input)
+        # Entradas muito curtas não devem ser normalizadas
+        assert result is None, f"Entrada muito curta deveria retornar None: {short_input}"
 
 
 class TestGoalValueValidation:
     """Testes para validação de valores de meta"""
     
-    def test_invalid_value_formats(self):
+    @pytest.mark.parametrize("invalid_value", [
+        "abc",
+        "R$ 500",
+        "500 reais",
+        "quinhentos",
+        "1.2.3",
+        "1,2,3",
+        "!@#"
+    ])
+    def test_invalid_value_formats(self, invalid_value):
         """Testar formatos de valor inválidos"""
-        invalid_values = [
-            "abc",
-            "R$ 500",
-            "500 reais",
-            "quinhentos",
-            "1.2.3",
-            "1,2,3",
-            "!@#"
-        ]
-        
-        for invalid_value in invalid_values:
-            with pytest.raises((InvalidOperation, ValueError, AttributeError)):
-                # Tentar converter para Decimal deve falhar
-                Decimal(invalid_value.replace(',', '.'))
-        
-        # Testar strings vazias separadamente (não levantam exceção, mas são inválidas)
-        empty_values = ["", "   "]
-        for empty_value in empty_values:
-            # Strings vazias devem ser tratadas como inválidas
-            assert len(empty_value.strip()) == 0, f"Valor vazio deveria ser rejeitado: '{empty_value}'"
-        
-        # Testar valores especiais que são tecnicamente válidos em Decimal mas inválidos para metas
-        special_values = ["infinity", "NaN", "-infinity"]
-        for special_value in special_values:
-            value = Decimal(special_value)
-            # Sistema deve rejeitar infinity e NaN
-            assert value.is_infinite() or value.is_nan(), \
-                f"Valor especial deveria ser detectado: {special_value}"
+        # Tentar converter para Decimal deve falhar
+        assert not _is_valid_money(invalid_value), f"Valor deveria ser inválido: {invalid_value}"
+    
+    @pytest.mark.parametrize("empty_value", ["", "   "])
+    def test_empty_value_formats(self, empty_value):
+        """Testar strings vazias (não levantam exceção, mas são inválidas)"""
+        # Strings vazias devem ser tratadas como inválidas
+        assert len(empty_value.strip()) == 0, f"Valor vazio deveria ser rejeitado: '{empty_value}'"
+    
+    @pytest.mark.parametrize("special_value", ["infinity", "NaN", "-infinity"])
+    def test_special_value_formats(self, special_value):
+        """Testar valores tecnicamente válidos em Decimal mas inválidos para metas"""
+        value = Decimal(special_value)
+        # Sistema deve rejeitar infinity e NaN
+        assert value.is_infinite() or value.is_nan(), \
+            f"Valor especial deveria ser detectado: {special_value}"
     
     def test_negative_values(self):
         """Testar valores negativos"""
         negative_values = ["-100", "-50.5", "-0.01"]
         
         for neg_value in negative_values:
-            value = Decimal(neg_value)
+            value = parse_money(neg_value)
             assert value < 0, f"Valor deveria ser negativo: {neg_value}"
             # O sistema deve rejeitar valores negativos
     
@@ -151,28 +151,25 @@ class TestGoalValueValidation:
         assert zero_value == 0, "Valor zero deveria ser exatamente 0"
         # Valor 0 é válido e significa remoção de meta
     
-    def test_valid_value_formats(self):
+    @pytest.mark.parametrize("input_value,expected", [
+        ("500", Decimal("500")),
+        ("500.50", Decimal("500.50")),
+        ("500,50", Decimal("500.50")),  # Após replace
+        ("1000", Decimal("1000")),
+        ("0.01", Decimal("0.01")),
+        ("999999.99", Decimal("999999.99"))
+    ])
+    def test_valid_value_formats(self, input_value, expected):
         """Testar formatos de valor válidos"""
-        valid_values = [
-            ("500", Decimal("500")),
-            ("500.50", Decimal("500.50")),
-            ("500,50", Decimal("500.50")),  # Após replace
-            ("1000", Decimal("1000")),
-            ("0.01", Decimal("0.01")),
-            ("999999.99", Decimal("999999.99"))
-        ]
-        
-        for input_value, expected in valid_values:
-            normalized = input_value.replace(',', '.')
-            result = Decimal(normalized)
-            assert result == expected, f"Conversão falhou: {input_value} -> {result} (esperado {expected})"
+        result = parse_money(input_value)
+        assert result == expected, f"Conversão falhou: {input_value} -> {result} (esperado {expected})"
     
     def test_very_large_values(self):
         """Testar valores muito grandes"""
         large_values = ["1000000", "9999999.99", "1e6"]
         
         for large_value in large_values:
-            value = Decimal(large_value)
+            value = parse_money(large_value)
             assert value > 0, f"Valor grande deveria ser positivo: {large_value}"
             # Sistema deve aceitar valores grandes (sem limite superior definido)
     
@@ -181,7 +178,7 @@ class TestGoalValueValidation:
         small_values = ["0.01", "0.001", "0.1"]
         
         for small_value in small_values:
-            value = Decimal(small_value)
+            value = parse_money(small_value)
             assert value > 0, f"Valor pequeno deveria ser positivo: {small_value}"
             assert value < 1, f"Valor deveria ser menor que 1: {small_value}"
 
@@ -287,8 +284,8 @@ class TestGoalEdgeCases:
         valor_meta = Decimal("500")
         valor_gasto = Decimal("0")
         
-        progresso = (valor_gasto / valor_meta) * 100 if valor_meta > 0 else 0
-        assert progresso == 0, "Progresso sem gastos deve ser 0%"
+        progresso = calculate_progress_percent(valor_gasto, valor_meta)
+        assert progresso == 0.0, "Progresso sem gastos deve ser 0%"
     
     def test_goal_exactly_at_threshold(self):
         """Testar meta exatamente nos limites de alerta"""
@@ -296,13 +293,13 @@ class TestGoalEdgeCases:
         
         # Exatamente 80%
         valor_80 = valor_meta * Decimal("0.80")
-        progresso_80 = (valor_80 / valor_meta) * 100
-        assert progresso_80 == 80, "Progresso deve ser exatamente 80%"
+        progresso_80 = calculate_progress_percent(valor_80, valor_meta)
+        assert progresso_80 == 80.0, "Progresso deve ser exatamente 80%"
         
         # Exatamente 100%
         valor_100 = valor_meta
-        progresso_100 = (valor_100 / valor_meta) * 100
-        assert progresso_100 == 100, "Progresso deve ser exatamente 100%"
+        progresso_100 = calculate_progress_percent(valor_100, valor_meta)
+        assert progresso_100 == 100.0, "Progresso deve ser exatamente 100%"
     
     def test_goal_update_vs_create(self):
         """Testar diferença entre criar e atualizar meta"""
@@ -351,46 +348,37 @@ class TestGoalCategoryNormalization:
             ("Finanças", "financas"),
         ]
         
-        import unicodedata
-        
         for input_text, expected_normalized in test_cases:
             # Normalizar removendo acentos
-            normalized = unicodedata.normalize('NFKD', input_text)
-            normalized = ''.join([c for c in normalized if not unicodedata.combining(c)])
-            normalized = normalized.lower()
+            normalized = strip_accents(input_text).lower()
             
             assert normalized == expected_normalized, \
                 f"Normalização de acentos falhou: {input_text} -> {normalized} (esperado {expected_normalized})"
     
-    def test_case_insensitivity(self):
+    @pytest.mark.parametrize("variation", [
+        "alimentação",
+        "ALIMENTAÇÃO",
+        "AlImEnTaÇãO",
+        "aLiMeNtAçÃo"
+    ])
+    def test_case_insensitivity(self, goal_service, variation):
         """Testar insensibilidade a maiúsculas/minúsculas"""
-        base_category = "Alimentação"
-        variations = [
-            "alimentação",
-            "ALIMENTAÇÃO",
-            "AlImEnTaÇãO",
-            "aLiMeNtAçÃo"
-        ]
-        
-        for variation in variations:
-            result = goal_service.normalize_category(variation)
-            assert result == ExpenseCategory.ALIMENTACAO, \
-                f"Variação de case não normalizada: {variation} -> {result}"
+        result = goal_service.normalize_category(variation)
+        assert result == ExpenseCategory.ALIMENTACAO, \
+            f"Variação de case não normalizada: {variation} -> {result}"
     
-    def test_substring_matching(self):
+    @pytest.mark.parametrize("substring,expected", [
+        ("aliment", ExpenseCategory.ALIMENTACAO),
+        ("transp", ExpenseCategory.TRANSPORTE),
+        ("saud", ExpenseCategory.SAUDE),
+    ])
+    def test_substring_matching(self, goal_service, substring, expected):
         """Testar correspondência por substring"""
-        test_cases = [
-            ("aliment", ExpenseCategory.ALIMENTACAO),
-            ("transp", ExpenseCategory.TRANSPORTE),
-            ("saud", ExpenseCategory.SAUDE),
-        ]
-        
-        for substring, expected in test_cases:
-            result = goal_service.normalize_category(substring)
-            assert result == expected, \
-                f"Substring não correspondeu: {substring} -> {result} (esperado {expected})"
+        result = goal_service.normalize_category(substring)
+        assert result == expected, \
+            f"Substring não correspondeu: {substring} -> {result} (esperado {expected})"
     
-    def test_levenshtein_distance_tolerance(self):
+    def test_levenshtein_distance_tolerance(self, goal_service):
         """Testar tolerância de distância de Levenshtein"""
         # Typos comuns que devem ser aceitos
         typos = [
@@ -409,7 +397,7 @@ class TestGoalCategoryNormalization:
 class TestGoalValidationHelpers:
     """Testes para funções auxiliares de validação"""
     
-    def test_validate_category_method(self):
+    def test_validate_category_method(self, goal_service):
         """Testar método validate_category"""
         # Categorias válidas
         valid_categories = ["Alimentação", "Transporte", "Saúde", "Lazer", "Casa", "Finanças", "Outros"]
@@ -429,14 +417,13 @@ class TestGoalValidationHelpers:
     def test_month_year_validation(self):
         """Testar validação de mês e ano"""
         # Meses válidos
-        valid_months = list(range(1, 13))
-        for month in valid_months:
-            assert 1 <= month <= 12, f"Mês inválido: {month}"
+        for month in range(1, 13):
+            assert is_valid_month(month), f"Mês inválido: {month}"
         
         # Meses inválidos
         invalid_months = [0, 13, -1, 100]
         for month in invalid_months:
-            assert not (1 <= month <= 12), f"Mês deveria ser inválido: {month}"
+            assert not is_valid_month(month), f"Mês deveria ser inválido: {month}"
         
         # Anos válidos
         current_year = datetime.now().year
@@ -2,157 +2,145 @@
 Integration tests for goal system with expense flow
 """
 
+import asyncio
 import pytest
-from datetime import datetime
 from decimal import Decimal
+from unittest.mock import AsyncMock
 
-from models.schemas import ExpenseCategory
+from models.schemas import ExpenseCategory, GoalResponse
 from services.goal_service import goal_service
 
+# Category and spending amounts passed to check_goal_alerts, resolved once at import
+CATEGORY_WITHOUT_GOAL = ExpenseCategory.OUTROS
+SPENDING_WITHOUT_GOAL = Decimal('100.00')
+SPENDING_BELOW_80_PERCENT = Decimal('500.00')
 
-@pytest.mark.asyncio
-class TestGoalExpenseIntegration:
-    """Test integration between goal system and expense flow"""
+
+@pytest.fixture(scope="module", autouse=True)
+def _validate_progress_schema():
+    """Fields shown in confirmation messages, checked once per module"""
+    required = {'valor_meta', 'valor_gasto', 'progresso_percentual', 'status'}
+    assert required <= GoalResponse.model_fields.keys()
+
+
+@pytest.fixture(scope="module")
+def event_loop():
+    """Single event loop shared by every test in this module"""
+    loop = asyncio.get_event_loop_policy().new_event_loop()
+    yield loop
+    loop.close()
+
+
+def test_expense_without_goal_no_alert(monkeypatch, now):
+    """
+    Test that expenses for categories without goals
+    don't trigger any alerts.
     
-    async def test_expense_with_goal_shows_progress(self):
-        """
-        Test that when an expense is registered and a goal exists,
-        the confirmation message includes goal progress information.
-        
-        **Feature: metas-financeiras, Integration Test**
-        **Validates: Requirements 4.1**
-        """
-        user_id = 12345
-        categoria = ExpenseCategory.ALIMENTACAO
-        valor_meta = Decimal('500.00')
-        
-        now = datetime.now()
-        
-        # Create a goal
-        goal = await goal_service.create_or_update_goal(
-            user_id=user_id,
-            categoria=categoria,
-            valor_meta=valor_meta,
-            mes=now.month,
-            ano=now.year
-        )
-        
-        assert goal is not None
-        
-        # Get progress (simulating what happens in _send_confirmation)
-        progress = await goal_service.get_goal_progress(
-            user_id=user_id,
-            categoria=categoria,
-            mes=now.month,
-            ano=now.year
-        )
-        
-        # Verify progress is returned
-        assert progress is not None
-        assert progress.categoria == categoria
-        assert progress.valor_meta == valor_meta
-        
-        # Clean up
-        await goal_service.delete_goal(user_id, categoria, now.month, now.year)
+    **Feature: metas-financeiras, Integration Test**
+    **Validates: Requirements 4.1**
+    """
+    user_id = 12349
+    categoria = CATEGORY_WITHOUT_GOAL
     
-    async def test_expense_without_goal_no_alert(self):
-        """
-        Test that expenses for categories without goals
-        don't trigger any alerts.
-        
-        **Feature: metas-financeiras, Integration Test**
-        **Validates: Requirements 4.1**
-        """
-        user_id = 12349
-        categoria = ExpenseCategory.OUTROS
-        
-        # Don't create a goal
-        
-        # Try to check for alert (no transactions exist, so progress will be 0)
-        alert = await goal_service.check_goal_alerts(
-            user_id=user_id,
-            categoria=categoria,
-            current_spending=Decimal('100.00')
-        )
-        
-        # No alert should be triggered (no goal exists)
-        assert alert is None
+    # No goal for the category: check_goal_alerts never reaches the database
+    get_goal_progress = AsyncMock(return_value=None)
+    monkeypatch.setattr(goal_service, "get_goal_progress", get_goal_progress)
     
-    async def test_expense_below_80_percent_no_alert(self):
-        """
-        Test that expenses below 80% of goal don't trigger alerts.
-        
-        **Feature: metas-financeiras, Integration Test**
-        **Validates: Requirements 4.2**
-        """
-        user_id = 12350
-        categoria = ExpenseCategory.CASA
-        valor_meta = Decimal('1000.00')
-        
-        now = datetime.now()
-        
-        # Create a goal
-        await goal_service.create_or_update_goal(
-            user_id=user_id,
-            categoria=categoria,
-            valor_meta=valor_meta,
-            mes=now.month,
-            ano=now.year
-        )
-        
-        # Check for alert (no transactions exist, so progress will be 0%)
-        alert = await goal_service.check_goal_alerts(
-            user_id=user_id,
-            categoria=categoria,
-            current_spending=Decimal('500.00')
-        )
-        
-        # No alert should be triggered (0% < 80%)
-        assert alert is None
-        
-        # Clean up
-        await goal_service.delete_goal(user_id, categoria, now.month, now.year)
+    alert = asyncio.run(goal_service.check_goal_alerts(
+        user_id=user_id,
+        categoria=categoria,
+        current_spending=SPENDING_WITHOUT_GOAL
+    ))
+    
+    # No alert should be triggered (no goal exists)
+    assert alert is None
+    get_goal_progress.assert_awaited_once_with(user_id, categoria, now.month, now.year)
+
+
+async def _check_progress_shown(user_id, categoria, valor_meta, mes, ano):
+    """
+    When an expense is registered and a goal exists, the confirmation
+    message includes goal progress information.
+    
+    **Validates: Requirements 4.1**
+    """
+    # Get progress (simulating what happens in _send_confirmation)
+    progress = await goal_service.get_goal_progress(
+        user_id=user_id,
+        categoria=categoria,
+        mes=mes,
+        ano=ano
+    )
+    
+    # Verify progress is returned
+    assert progress is not None
+    assert progress.categoria == categoria
+    assert progress.valor_meta == valor_meta
+
+
+async def _check_below_80_percent_no_alert(user_id, categoria, valor_meta, mes, ano):
+    """
+    Expenses below 80% of goal don't trigger alerts.
+    
+    **Validates: Requirements 4.2**
+    """
+    # Check for alert (no transactions exist, so progress will be 0%)
+    alert = await goal_service.check_goal_alerts(
+        user_id=user_id,
+        categoria=categoria,
+        current_spending=SPENDING_BELOW_80_PERCENT
+    )
+    
+    # No alert should be triggered (0% < 80%)
+    assert alert is None
+
+
+async def _check_goal_info_structure(user_id, categoria, valor_meta, mes, ano):
+    """
+    Goal progress structure is correct for display in confirmation messages.
+    
+    **Validates: Requirements 4.1**
+    """
+    progress = await goal_service.get_goal_progress(
+        user_id=user_id,
+        categoria=categoria,
+        mes=mes,
+        ano=ano
+    )
+    
+    # Verify structure (field presence is checked once by _validate_progress_schema)
+    assert isinstance(progress, GoalResponse)
+    assert progress.valor_meta == valor_meta
+    assert progress.valor_gasto >= 0
+    assert progress.progresso_percentual >= 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("in_memory_sqlite")
+class TestGoalExpenseIntegration:
+    """Test integration between goal system and expense flow"""
     
-    async def test_goal_info_structure(self):
+    @pytest.mark.parametrize("seeded_goal,check", [
+        pytest.param(
+            (12345, ExpenseCategory.ALIMENTACAO, Decimal('500.00')),
+            _check_progress_shown,
+            id="shows_progress"
+        ),
+        pytest.param(
+            (12350, ExpenseCategory.CASA, Decimal('1000.00')),
+            _check_below_80_percent_no_alert,
+            id="below_80_percent_no_alert"
+        ),
+        pytest.param(
+            (12351, ExpenseCategory.FINANCAS, Decimal('2000.00')),
+            _check_goal_info_structure,
+            id="goal_info_structure"
+        ),
+    ], indirect=["seeded_goal"])
+    async def test_expense_with_goal(self, seeded_goal, check):
         """
-        Test that goal progress structure is correct for display
-        in confirmation messages.
+        Each scenario seeds a goal for the current month and runs its own checks.
         
         **Feature: metas-financeiras, Integration Test**
-        **Validates: Requirements 4.1**
         """
-        user_id = 12351
-        categoria = ExpenseCategory.FINANCAS
-        valor_meta = Decimal('2000.00')
-        
-        now = datetime.now()
-        
-        # Create a goal
-        await goal_service.create_or_update_goal(
-            user_id=user_id,
-            categoria=categoria,
-            valor_meta=valor_meta,
-            mes=now.month,
-            ano=now.year
-        )
-        
-        # Get progress
-        progress = await goal_service.get_goal_progress(
-            user_id=user_id,
-            categoria=categoria,
-            mes=now.month,
-            ano=now.year
-        )
-        
-        # Verify structure
-        assert progress is not None
-        assert hasattr(progress, 'valor_meta')
-        assert hasattr(progress, 'valor_gasto')
-        assert hasattr(progress, 'progresso_percentual')
-        assert hasattr(progress, 'status')
-        assert progress.valor_meta == valor_meta
-        assert progress.valor_gasto >= 0
-        assert progress.progresso_percentual >= 0
-        
-        # Clean up
-        await goal_service.delete_goal(user_id, categoria, now.month, now.year)
+        await check(*seeded_goal)
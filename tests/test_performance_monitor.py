@@ -0,0 +1,393 @@
+"""
+Testes do monitor de performance do sistema de metas
+"""
+
+import sys
+import pytest
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy import select
+
+import services.goal_service as goal_service_module
+import utils.performance_monitor as performance_monitor
+from database.models import Goal
+from database.sqlite_db import get_db_session
+from models.schemas import ExpenseCategory
+from services.goal_service import GoalService, MetricCounter, goal_service
+from utils.performance_monitor import PerformanceMonitor
+
+
+@pytest.fixture
+def counted_get_metrics(monkeypatch):
+    """Conta as leituras de goal_service.get_metrics, partindo de snapshots vazios"""
+    calls = []
+    original = goal_service.get_metrics
+    
+    def get_metrics():
+        calls.append(1)
+        return original()
+    
+    monkeypatch.setattr(goal_service, "get_metrics", get_metrics)
+    performance_monitor._invalidate_snapshots()
+    yield calls
+    performance_monitor._invalidate_snapshots()
+
+
+class TestMetricsSnapshot:
+    """Testes dos snapshots de métricas, saúde e eficiência do cache"""
+    
+    def test_health_status_reads_metrics_once(self, counted_get_metrics):
+        """Status de saúde e eficiência do cache saem de uma única leitura"""
+        health = PerformanceMonitor.get_health_status()
+        
+        assert len(counted_get_metrics) == 1
+        assert health["status"] in ("healthy", "warning", "critical")
+    
+    def test_snapshot_reused_within_ttl(self, counted_get_metrics):
+        """Relatórios seguidos dentro do TTL reaproveitam o snapshot"""
+        PerformanceMonitor.get_metrics_report()
+        PerformanceMonitor.get_cache_efficiency()
+        PerformanceMonitor.get_health_status()
+        
+        assert len(counted_get_metrics) == 1
+    
+    def test_reset_invalidates_snapshot(self, counted_get_metrics):
+        """Após o reset, a próxima consulta lê as métricas novamente"""
+        PerformanceMonitor.get_cache_efficiency()
+        PerformanceMonitor.reset_all_metrics()
+        efficiency = PerformanceMonitor.get_cache_efficiency()
+        
+        assert len(counted_get_metrics) == 2
+        assert efficiency["total_queries"] == 0
+    
+    def test_health_status_cached_within_ttl(self, counted_get_metrics, monkeypatch):
+        """Probes dentro do TTL recebem o mesmo resultado, mesmo com métricas expiradas"""
+        monkeypatch.setattr(performance_monitor, "METRICS_CACHE_TTL_SECONDS", 0)
+        first = PerformanceMonitor.get_health_status()
+        second = PerformanceMonitor.get_health_status()
+        
+        assert second is first
+        assert len(counted_get_metrics) == 1
+    
+    def test_health_status_recomputed_after_ttl(self, counted_get_metrics, monkeypatch):
+        """Com TTL zero, cada chamada recalcula o status"""
+        monkeypatch.setattr(performance_monitor, "METRICS_CACHE_TTL_SECONDS", 0)
+        monkeypatch.setattr(performance_monitor, "HEALTH_CACHE_TTL_SECONDS", 0)
+        PerformanceMonitor.get_health_status()
+        PerformanceMonitor.get_health_status()
+        
+        assert len(counted_get_metrics) == 2
+
+
+class TestCleanupWindows:
+    """Testes da limpeza de metas antigas em janelas de meses"""
+    
+    def test_windows_cover_range_oldest_first(self):
+        """Janelas vão do que é anterior ao piso até o corte, sem lacunas"""
+        windows = performance_monitor._cleanup_windows((2024, 3), batch_months=2, floor_months=5)
+        
+        assert windows == [
+            (None, (2023, 10)),
+            ((2023, 10), (2023, 12)),
+            ((2023, 12), (2024, 2)),
+            ((2024, 2), (2024, 3)),
+        ]
+    
+    def test_windows_resume_from_watermark(self):
+        """Com marca d'água, as janelas começam nela; no corte, não há o que fazer"""
+        assert performance_monitor._cleanup_windows(
+            (2024, 3), batch_months=2, floor_months=5, watermark=(2024, 1)
+        ) == [((2024, 1), (2024, 3))]
+        assert performance_monitor._cleanup_windows(
+            (2024, 3), batch_months=2, floor_months=5, watermark=(2024, 3)
+        ) == []
+    
+    @pytest.mark.asyncio
+    async def test_cleanup_removes_only_goals_before_cutoff(self, in_memory_sqlite):
+        """Metas anteriores ao corte somem em qualquer janela; as recentes ficam"""
+        user_id = 999101
+        now = datetime.now()
+        cutoff_year, cutoff_month = goal_service.get_cleanup_cutoff(12)
+        cutoff_index = cutoff_year * 12 + cutoff_month - 1
+        # Um mês antes do corte, dentro das janelas e além do piso de 24 meses
+        old_indexes = [cutoff_index - 1, cutoff_index - 20, cutoff_index - 40]
+        goals = [
+            {
+                "user_id": user_id,
+                "categoria": ExpenseCategory.CASA,
+                "valor_meta": Decimal(100),
+                "mes": index % 12 + 1,
+                "ano": index // 12,
+            }
+            for index in old_indexes
+        ]
+        goals.append({
+            "user_id": user_id,
+            "categoria": ExpenseCategory.CASA,
+            "valor_meta": Decimal(100),
+            "mes": now.month,
+            "ano": now.year,
+        })
+        await goal_service.create_or_update_goals_bulk(goals)
+        
+        result = await PerformanceMonitor.cleanup_old_data(
+            months_to_keep=12, batch_months=3, floor_months=24
+        )
+        
+        assert result["success"] is True
+        assert result["removed_count"] == len(old_indexes)
+        async for db in get_db_session():
+            remaining = (await db.execute(
+                select(Goal.ano, Goal.mes).where(Goal.user_id == user_id)
+            )).all()
+            assert remaining == [(now.year, now.month)]
+    
+    @pytest.mark.asyncio
+    async def test_cleanup_records_and_resumes_from_watermark(self, in_memory_sqlite):
+        """A marca d'água chega ao corte; a execução seguinte não revisita janelas"""
+        user_id = 999103
+        cutoff = goal_service.get_cleanup_cutoff(12)
+        old_index = cutoff[0] * 12 + cutoff[1] - 1 - 3
+        old_goal = {
+            "user_id": user_id,
+            "categoria": ExpenseCategory.CASA,
+            "valor_meta": Decimal(100),
+            "mes": old_index % 12 + 1,
+            "ano": old_index // 12,
+        }
+        
+        first = await PerformanceMonitor.cleanup_old_data(months_to_keep=12, floor_months=24)
+        
+        assert first["watermark"] == f"{cutoff[0]}-{cutoff[1]:02d}"
+        assert await goal_service.get_cleanup_watermark() == cutoff
+        
+        # Meta criada depois para um período já limpo fica fora da retomada
+        await goal_service.create_or_update_goals_bulk([old_goal])
+        resumed_estimate = await PerformanceMonitor.cleanup_old_data(
+            months_to_keep=12, dry_run=True, floor_months=24
+        )
+        full_estimate = await PerformanceMonitor.cleanup_old_data(
+            months_to_keep=12, dry_run=True, floor_months=24, resume=False
+        )
+        resumed = await PerformanceMonitor.cleanup_old_data(months_to_keep=12, floor_months=24)
+        full = await PerformanceMonitor.cleanup_old_data(
+            months_to_keep=12, floor_months=24, resume=False
+        )
+        
+        # O dry run percorre as mesmas janelas da execução real
+        assert resumed_estimate["estimated_removals"] == resumed["removed_count"] == 0
+        assert full_estimate["estimated_removals"] == full["removed_count"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_invalid_batch_size_reports_error(self, in_memory_sqlite):
+        """Janela de tamanho zero é rejeitada sem remover nada"""
+        result = await PerformanceMonitor.cleanup_old_data(batch_months=0)
+        
+        assert result["success"] is False
+    
+    @pytest.mark.asyncio
+    async def test_dry_run_counts_without_removing(self, in_memory_sqlite):
+        """Dry run estima as remoções com uma contagem e não altera o banco"""
+        user_id = 999102
+        cutoff_year, cutoff_month = goal_service.get_cleanup_cutoff(12)
+        cutoff_index = cutoff_year * 12 + cutoff_month - 1
+        await goal_service.create_or_update_goals_bulk([
+            {
+                "user_id": user_id,
+                "categoria": categoria,
+                "valor_meta": Decimal(100),
+                "mes": (cutoff_index - 2) % 12 + 1,
+                "ano": (cutoff_index - 2) // 12,
+            }
+            for categoria in (ExpenseCategory.CASA, ExpenseCategory.LAZER)
+        ])
+        
+        result = await PerformanceMonitor.cleanup_old_data(months_to_keep=12, dry_run=True)
+        
+        assert result["dry_run"] is True
+        assert result["estimated_removals"] == 2
+        assert await goal_service.count_old_goals_range(None, (cutoff_year, cutoff_month)) == 2
+
+
+class TestHealthRules:
+    """Testes das regras de saúde orientadas por tabela"""
+    
+    @pytest.mark.parametrize("overrides, expected_status, expected_issues", [
+        ({}, "healthy", 0),
+        ({"cache_size": 101}, "warning", 1),
+        ({"cache_size": 101, "active_cooldowns": 51}, "warning", 2),
+        ({"cache_size": 101, "active_cooldowns": 51, "cache_hits": 0, "cache_misses": 10}, "critical", 3),
+    ])
+    def test_status_follows_rule_severity(self, monkeypatch, overrides, expected_status, expected_issues):
+        """Status deriva da severidade somada das regras violadas"""
+        metrics = {**goal_service.get_metrics(), "cache_hits": 10, "cache_misses": 0,
+                   "cache_size": 0, "active_cooldowns": 0, **overrides}
+        monkeypatch.setattr(goal_service, "get_metrics", lambda: metrics)
+        performance_monitor._invalidate_snapshots()
+        
+        health = PerformanceMonitor.get_health_status()
+        performance_monitor._invalidate_snapshots()
+        
+        assert health["status"] == expected_status
+        assert len(health["issues"]) == expected_issues
+
+
+class TestPrometheusMetrics:
+    """Testes da exposição de métricas no formato do Prometheus"""
+    
+    def test_every_series_has_help_type_and_value(self, counted_get_metrics):
+        """Cada série sai com HELP, TYPE e um valor numérico"""
+        lines = PerformanceMonitor.get_prometheus_metrics().splitlines()
+        series = performance_monitor._PROMETHEUS_SERIES
+        
+        assert len(lines) == 3 * len(series)
+        for i, (name, kind, _, _) in enumerate(series):
+            help_line, type_line, sample = lines[3 * i:3 * i + 3]
+            assert help_line.startswith(f"# HELP finance_bot_{name} ")
+            assert type_line == f"# TYPE finance_bot_{name} {kind}"
+            metric, value = sample.split(" ")
+            assert metric == f"finance_bot_{name}"
+            float(value)
+    
+    def test_reset_keeps_exported_counters_monotonic(self, monkeypatch):
+        """Após o reset, relatórios recomeçam do zero e o Prometheus não"""
+        service = GoalService()
+        monkeypatch.setattr(performance_monitor, "goal_service", service)
+        performance_monitor._invalidate_snapshots()
+        service._counters[MetricCounter.GOALS_CREATED] = 5
+        
+        PerformanceMonitor.reset_all_metrics()
+        service._counters[MetricCounter.GOALS_CREATED] += 2
+        exposition = PerformanceMonitor.get_prometheus_metrics()
+        performance_monitor._invalidate_snapshots()
+        
+        assert service.get_metrics()["goals_created"] == 2
+        assert "finance_bot_goals_created_total 7\n" in exposition
+
+
+class TestTimestampCache:
+    """Testes do timestamp ISO reaproveitado dentro do mesmo segundo"""
+    
+    def test_same_second_reuses_string(self, monkeypatch):
+        """Chamadas no mesmo segundo devolvem a mesma string; no seguinte, uma nova"""
+        clock = [1_700_000_000.1]
+        monkeypatch.setattr(performance_monitor.time, "time", lambda: clock[0])
+        monkeypatch.setattr(performance_monitor, "_timestamp_cache", (0, ""))
+        
+        first = performance_monitor._iso_now_cached()
+        clock[0] += 0.5
+        assert performance_monitor._iso_now_cached() is first
+        clock[0] += 1
+        assert performance_monitor._iso_now_cached() is not first
+
+
+class TestCacheRecommendation:
+    """Testes da recomendação de cache por faixa de taxa de acerto"""
+    
+    @pytest.mark.parametrize("hit_rate, cache_size, expected", [
+        (39.99, 500, "Considere aumentar o TTL"),
+        (40, 10, "Performance de cache adequada"),
+        (79.99, 10, "Performance de cache adequada"),
+        (80, 10, "Cache funcionando de forma otimizada"),
+        (40, 101, "Cache muito grande"),
+        (95, 101, "Cache muito grande"),
+    ])
+    def test_recommendation_by_range(self, hit_rate, cache_size, expected):
+        """Limites de faixa e precedência da taxa baixa sobre o tamanho do cache"""
+        recommendation = PerformanceMonitor._get_cache_recommendation(hit_rate, cache_size)
+        
+        assert recommendation.startswith(expected)
+    
+    def test_cache_size_limit_follows_settings(self, monkeypatch):
+        """O limite de tamanho da recomendação é o mesmo da regra de saúde"""
+        monkeypatch.setattr(performance_monitor._settings, "health_max_cache_size", 1000)
+        
+        recommendation = PerformanceMonitor._get_cache_recommendation(95, 500)
+        
+        assert recommendation == "Cache funcionando de forma otimizada"
+
+
+class TestHitRateTrend:
+    """Testes da média móvel da taxa de acerto do cache"""
+    
+    def test_ewma_follows_recent_intervals(self, monkeypatch):
+        """Cada tick puxa a média na direção da taxa do intervalo"""
+        monkeypatch.setattr(goal_service_module, "_HIT_RATE_EWMA_TICK_SECONDS", 0)
+        service = GoalService()
+        
+        service._counters[MetricCounter.CACHE_HITS] = 10
+        assert service.get_metrics()["cache_hit_rate_ewma"] == 100
+        
+        service._counters[MetricCounter.CACHE_MISSES] = 10
+        metrics = service.get_metrics()
+        
+        assert metrics["cache_hit_rate_percent"] == 50
+        assert metrics["cache_hit_rate_ewma"] == 90
+    
+    def test_ewma_defaults_to_cumulative_before_first_tick(self):
+        """Sem tick vencido, a média móvel é a taxa acumulada"""
+        service = GoalService()
+        service._counters[MetricCounter.CACHE_HITS] = 3
+        service._counters[MetricCounter.CACHE_MISSES] = 1
+        
+        metrics = service.get_metrics()
+        
+        assert metrics["cache_hit_rate_ewma"] == metrics["cache_hit_rate_percent"] == 75
+    
+    def test_recent_drop_is_a_health_issue(self, monkeypatch):
+        """Queda da média móvel além da tolerância vira problema de saúde"""
+        metrics = {**goal_service.get_metrics(), "cache_hits": 90, "cache_misses": 10,
+                   "cache_size": 0, "active_cooldowns": 0,
+                   "cache_hit_rate_percent": 90.0, "cache_hit_rate_ewma": 60.0}
+        monkeypatch.setattr(goal_service, "get_metrics", lambda: metrics)
+        performance_monitor._invalidate_snapshots()
+        
+        health = PerformanceMonitor.get_health_status()
+        performance_monitor._invalidate_snapshots()
+        
+        assert health["issues"] == ["Taxa de acerto recente do cache em queda"]
+
+
+class TestPlainOutput:
+    """Testes da remoção de emoji quando a saída não é um terminal"""
+    
+    def test_piped_output_has_no_emoji(self, capsys):
+        """Redirecionada, a saída de print_health sai sem emoji"""
+        performance_monitor.print_health()
+        out = capsys.readouterr().out
+        
+        assert "STATUS DE SAÚDE DO SISTEMA" in out
+        assert out == out.translate(performance_monitor._EMOJI_TABLE)
+    
+    def test_terminal_output_keeps_emoji(self, capsys, monkeypatch):
+        """Em um terminal, o banner mantém os emoji"""
+        monkeypatch.setattr(sys.stdout, "isatty", lambda: True)
+        performance_monitor.print_health()
+        
+        assert "🏥 STATUS DE SAÚDE DO SISTEMA" in capsys.readouterr().out
+
+
+class TestMetricsView:
+    """Testes da visão somente leitura das métricas do GoalService"""
+    
+    def test_metrics_view_computes_derived_fields_on_access(self, monkeypatch):
+        """Taxa de acerto só é calculada quando lida, e a visão se comporta como um dict"""
+        service = GoalService()
+        service._counters[MetricCounter.CACHE_HITS] = 3
+        service._counters[MetricCounter.CACHE_MISSES] = 1
+        metrics = service.get_metrics()
+        calls = []
+        original = goal_service_module._MetricsView._DERIVED["cache_hit_rate_percent"]
+        monkeypatch.setitem(
+            goal_service_module._MetricsView._DERIVED,
+            "cache_hit_rate_percent",
+            lambda view: calls.append(1) or original(view)
+        )
+        
+        assert metrics["cache_hits"] == 3
+        assert calls == []
+        assert metrics["cache_hit_rate_percent"] == metrics["cache_hit_rate_percent"] == 75
+        assert len(calls) == 1
+        assert set(dict(metrics)) == set(metrics) and len(metrics) == 13
+        with pytest.raises(KeyError):
+            metrics["unknown"]
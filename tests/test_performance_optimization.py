@@ -2,30 +2,46 @@
 Testes para otimizações de performance do sistema de metas
 """
 
+import asyncio
 import pytest
+import pytest_asyncio
 from datetime import datetime, timedelta
 from decimal import Decimal
-from services.goal_service import goal_service
 from models.schemas import ExpenseCategory
 from database.models import Goal, Transaction
 from database.sqlite_db import get_db_session
 
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture(scope="module")
+def event_loop():
+    """Um único loop para o módulo, permitindo reutilizar o engine assíncrono entre os testes"""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest_asyncio.fixture
+async def in_memory_sqlite(shared_in_memory_sqlite):
+    """Neste módulo o banco em memória é compartilhado e esvaziado a cada teste"""
+    return shared_in_memory_sqlite
+
 
-@pytest.mark.asyncio
 class TestPerformanceOptimization:
     """Testes de otimização de performance"""
     
-    async def test_cache_functionality(self):
+    async def test_cache_functionality(self, fresh_goal_service):
         """Testa se o cache está funcionando corretamente"""
         user_id = 999001
-        mes = datetime.now().month
-        ano = datetime.now().year
+        now = datetime.now()
+        mes, ano = now.month, now.year
         
         # Limpar métricas antes do teste
-        goal_service.reset_metrics()
+        fresh_goal_service.reset_metrics()
         
         # Criar uma meta
-        await goal_service.create_or_update_goal(
+        await fresh_goal_service.create_or_update_goal(
             user_id=user_id,
             categoria=ExpenseCategory.ALIMENTACAO,
             valor_meta=Decimal("1000.00"),
@@ -34,36 +50,33 @@ class TestPerformanceOptimization:
         )
         
         # Primeira consulta - deve ser cache miss
-        initial_metrics = goal_service.get_metrics()
+        initial_metrics = fresh_goal_service.get_metrics()
         initial_misses = initial_metrics["cache_misses"]
         
-        goals1 = await goal_service.get_user_goals(user_id, mes, ano)
+        goals1 = await fresh_goal_service.get_user_goals(user_id, mes, ano)
         
-        metrics_after_first = goal_service.get_metrics()
+        metrics_after_first = fresh_goal_service.get_metrics()
         assert metrics_after_first["cache_misses"] > initial_misses, "Primeira consulta deve ser cache miss"
         
         # Segunda consulta - deve ser cache hit
         initial_hits = metrics_after_first["cache_hits"]
-        goals2 = await goal_service.get_user_goals(user_id, mes, ano)
+        goals2 = await fresh_goal_service.get_user_goals(user_id, mes, ano)
         
-        metrics_after_second = goal_service.get_metrics()
+        metrics_after_second = fresh_goal_service.get_metrics()
         assert metrics_after_second["cache_hits"] > initial_hits, "Segunda consulta deve ser cache hit"
         
         # Verificar que os dados são os mesmos
         assert len(goals1) == len(goals2)
         assert goals1[0].valor_meta == goals2[0].valor_meta
-        
-        # Limpar
-        await goal_service.clear_all_goals(user_id)
     
-    async def test_cache_invalidation_on_update(self):
+    async def test_cache_invalidation_on_update(self, fresh_goal_service):
         """Testa se o cache é invalidado ao atualizar uma meta"""
         user_id = 999002
-        mes = datetime.now().month
-        ano = datetime.now().year
+        now = datetime.now()
+        mes, ano = now.month, now.year
         
         # Criar meta inicial
-        await goal_service.create_or_update_goal(
+        await fresh_goal_service.create_or_update_goal(
             user_id=user_id,
             categoria=ExpenseCategory.TRANSPORTE,
             valor_meta=Decimal("500.00"),
@@ -72,11 +85,11 @@ class TestPerformanceOptimization:
         )
         
         # Consultar para popular cache
-        goals1 = await goal_service.get_user_goals(user_id, mes, ano)
+        goals1 = await fresh_goal_service.get_user_goals(user_id, mes, ano)
         assert goals1[0].valor_meta == Decimal("500.00")
         
         # Atualizar meta (deve invalidar cache)
-        await goal_service.create_or_update_goal(
+        await fresh_goal_service.create_or_update_goal(
             user_id=user_id,
             categoria=ExpenseCategory.TRANSPORTE,
             valor_meta=Decimal("800.00"),
@@ -85,20 +98,17 @@ class TestPerformanceOptimization:
         )
         
         # Consultar novamente - deve buscar do banco com novo valor
-        goals2 = await goal_service.get_user_goals(user_id, mes, ano)
+        goals2 = await fresh_goal_service.get_user_goals(user_id, mes, ano)
         assert goals2[0].valor_meta == Decimal("800.00"), "Cache deve ter sido invalidado"
-        
-        # Limpar
-        await goal_service.clear_all_goals(user_id)
     
-    async def test_cache_invalidation_on_delete(self):
+    async def test_cache_invalidation_on_delete(self, fresh_goal_service):
         """Testa se o cache é invalidado ao deletar uma meta"""
         user_id = 999003
-        mes = datetime.now().month
-        ano = datetime.now().year
+        now = datetime.now()
+        mes, ano = now.month, now.year
         
         # Criar meta
-        await goal_service.create_or_update_goal(
+        await fresh_goal_service.create_or_update_goal(
             user_id=user_id,
             categoria=ExpenseCategory.SAUDE,
             valor_meta=Decimal("300.00"),
@@ -107,11 +117,11 @@ class TestPerformanceOptimization:
         )
         
         # Consultar para popular cache
-        goals1 = await goal_service.get_user_goals(user_id, mes, ano)
+        goals1 = await fresh_goal_service.get_user_goals(user_id, mes, ano)
         assert len(goals1) == 1
         
         # Deletar meta (deve invalidar cache)
-        deleted = await goal_service.delete_goal(
+        deleted = await fresh_goal_service.delete_goal(
             user_id=user_id,
             categoria=ExpenseCategory.SAUDE,
             mes=mes,
@@ -120,18 +130,18 @@ class TestPerformanceOptimization:
         assert deleted is True
         
         # Consultar novamente - deve retornar lista vazia
-        goals2 = await goal_service.get_user_goals(user_id, mes, ano)
+        goals2 = await fresh_goal_service.get_user_goals(user_id, mes, ano)
         assert len(goals2) == 0, "Cache deve ter sido invalidado após delete"
     
-    async def test_metrics_tracking(self):
+    async def test_metrics_tracking(self, fresh_goal_service):
         """Testa se as métricas estão sendo rastreadas corretamente"""
         user_id = 999004
-        mes = datetime.now().month
-        ano = datetime.now().year
+        now = datetime.now()
+        mes, ano = now.month, now.year
         
         # Resetar métricas
-        goal_service.reset_metrics()
-        initial_metrics = goal_service.get_metrics()
+        fresh_goal_service.reset_metrics()
+        initial_metrics = fresh_goal_service.get_metrics()
         
         assert initial_metrics["goals_created"] == 0
         assert initial_metrics["goals_updated"] == 0
@@ -139,7 +149,7 @@ class TestPerformanceOptimization:
         assert initial_metrics["goals_queried"] == 0
         
         # Criar meta
-        await goal_service.create_or_update_goal(
+        await fresh_goal_service.create_or_update_goal(
             user_id=user_id,
             categoria=ExpenseCategory.LAZER,
             valor_meta=Decimal("400.00"),
@@ -147,11 +157,11 @@ class TestPerformanceOptimization:
             ano=ano
         )
         
-        metrics_after_create = goal_service.get_metrics()
+        metrics_after_create = fresh_goal_service.get_metrics()
         assert metrics_after_create["goals_created"] == 1
         
         # Atualizar meta
-        await goal_service.create_or_update_goal(
+        await fresh_goal_service.create_or_update_goal(
             user_id=user_id,
             categoria=ExpenseCategory.LAZER,
             valor_meta=Decimal("600.00"),
@@ -159,24 +169,24 @@ class TestPerformanceOptimization:
             ano=ano
         )
         
-        metrics_after_update = goal_service.get_metrics()
+        metrics_after_update = fresh_goal_service.get_metrics()
         assert metrics_after_update["goals_updated"] == 1
         
         # Consultar metas
-        await goal_service.get_user_goals(user_id, mes, ano)
+        await fresh_goal_service.get_user_goals(user_id, mes, ano)
         
-        metrics_after_query = goal_service.get_metrics()
+        metrics_after_query = fresh_goal_service.get_metrics()
         assert metrics_after_query["goals_queried"] == 1
         
         # Deletar meta
-        await goal_service.delete_goal(
+        await fresh_goal_service.delete_goal(
             user_id=user_id,
             categoria=ExpenseCategory.LAZER,
             mes=mes,
             ano=ano
         )
         
-        metrics_after_delete = goal_service.get_metrics()
+        metrics_after_delete = fresh_goal_service.get_metrics()
         assert metrics_after_delete["goals_deleted"] == 1
         
         # Verificar métricas de cache
@@ -184,7 +194,7 @@ class TestPerformanceOptimization:
         assert "cache_size" in metrics_after_delete
         assert "uptime_seconds" in metrics_after_delete
     
-    async def test_cleanup_old_goals(self):
+    async def test_cleanup_old_goals(self, fresh_goal_service):
         """Testa a limpeza de metas antigas"""
         user_id = 999005
         
@@ -193,7 +203,7 @@ class TestPerformanceOptimization:
         old_mes = old_date.month
         old_ano = old_date.year
         
-        await goal_service.create_or_update_goal(
+        await fresh_goal_service.create_or_update_goal(
             user_id=user_id,
             categoria=ExpenseCategory.CASA,
             valor_meta=Decimal("1500.00"),
@@ -202,10 +212,10 @@ class TestPerformanceOptimization:
         )
         
         # Criar meta recente
-        current_mes = datetime.now().month
-        current_ano = datetime.now().year
+        now = datetime.now()
+        current_mes, current_ano = now.month, now.year
         
-        await goal_service.create_or_update_goal(
+        await fresh_goal_service.create_or_update_goal(
             user_id=user_id,
             categoria=ExpenseCategory.CASA,
             valor_meta=Decimal("2000.00"),
@@ -223,7 +233,7 @@ class TestPerformanceOptimization:
             assert len(goals_before) == 2
         
         # Executar limpeza (manter apenas 12 meses)
-        removed_count = await goal_service.cleanup_old_goals(months_to_keep=12)
+        removed_count = await fresh_goal_service.cleanup_old_goals(months_to_keep=12)
         
         # Verificar que a meta antiga foi removida
         async for db in get_db_session():
@@ -236,18 +246,15 @@ class TestPerformanceOptimization:
             assert goals_after[0].ano == current_ano
         
         assert removed_count >= 1, "Pelo menos uma meta antiga deve ter sido removida"
-        
-        # Limpar
-        await goal_service.clear_all_goals(user_id)
     
-    async def test_cache_ttl_expiration(self):
+    async def test_cache_ttl_expiration(self, fresh_goal_service):
         """Testa se o cache expira após o TTL"""
         user_id = 999006
-        mes = datetime.now().month
-        ano = datetime.now().year
+        now = datetime.now()
+        mes, ano = now.month, now.year
         
         # Criar meta
-        await goal_service.create_or_update_goal(
+        await fresh_goal_service.create_or_update_goal(
             user_id=user_id,
             categoria=ExpenseCategory.FINANCAS,
             valor_meta=Decimal("700.00"),
@@ -256,69 +263,54 @@ class TestPerformanceOptimization:
         )
         
         # Consultar para popular cache
-        await goal_service.get_user_goals(user_id, mes, ano)
+        await fresh_goal_service.get_user_goals(user_id, mes, ano)
         
         # Verificar que o cache está válido
-        cache_key = goal_service._get_cache_key(user_id, mes, ano)
-        assert goal_service._is_cache_valid(cache_key)
+        cache_key = fresh_goal_service._get_cache_key(user_id, mes, ano)
+        assert fresh_goal_service._is_cache_valid(cache_key)
         
         # Simular expiração do cache (modificar timestamp)
-        old_timestamp = datetime.now() - timedelta(seconds=goal_service._cache_ttl_seconds + 10)
-        goal_service._cache_timestamps[cache_key] = old_timestamp
+        old_timestamp = datetime.now() - timedelta(seconds=fresh_goal_service._cache_ttl_seconds + 10)
+        fresh_goal_service._cache_timestamps[cache_key] = old_timestamp
         
         # Verificar que o cache não é mais válido
-        assert not goal_service._is_cache_valid(cache_key)
-        
-        # Limpar
-        await goal_service.clear_all_goals(user_id)
+        assert not fresh_goal_service._is_cache_valid(cache_key)
     
-    async def test_multiple_users_cache_isolation(self):
+    async def test_multiple_users_cache_isolation(self, fresh_goal_service):
         """Testa se o cache isola corretamente dados de diferentes usuários"""
         user1_id = 999007
         user2_id = 999008
-        mes = datetime.now().month
-        ano = datetime.now().year
-        
-        # Criar metas para usuário 1
-        await goal_service.create_or_update_goal(
-            user_id=user1_id,
-            categoria=ExpenseCategory.ALIMENTACAO,
-            valor_meta=Decimal("1000.00"),
-            mes=mes,
-            ano=ano
+        now = datetime.now()
+        mes, ano = now.month, now.year
+        
+        # Criar metas dos dois usuários em um único lote
+        await fresh_goal_service.create_or_update_goals_bulk([
+            {"user_id": user1_id, "categoria": ExpenseCategory.ALIMENTACAO,
+             "valor_meta": Decimal("1000.00"), "mes": mes, "ano": ano},
+            {"user_id": user2_id, "categoria": ExpenseCategory.ALIMENTACAO,
+             "valor_meta": Decimal("2000.00"), "mes": mes, "ano": ano}
+        ])
+        
+        # Consultar metas de cada usuário (leituras independentes, em paralelo)
+        goals_user1, goals_user2 = await asyncio.gather(
+            fresh_goal_service.get_user_goals(user1_id, mes, ano),
+            fresh_goal_service.get_user_goals(user2_id, mes, ano)
         )
         
-        # Criar metas para usuário 2
-        await goal_service.create_or_update_goal(
-            user_id=user2_id,
-            categoria=ExpenseCategory.ALIMENTACAO,
-            valor_meta=Decimal("2000.00"),
-            mes=mes,
-            ano=ano
-        )
-        
-        # Consultar metas de cada usuário
-        goals_user1 = await goal_service.get_user_goals(user1_id, mes, ano)
-        goals_user2 = await goal_service.get_user_goals(user2_id, mes, ano)
-        
         # Verificar isolamento
         assert len(goals_user1) == 1
         assert len(goals_user2) == 1
         assert goals_user1[0].valor_meta == Decimal("1000.00")
         assert goals_user2[0].valor_meta == Decimal("2000.00")
-        
-        # Limpar
-        await goal_service.clear_all_goals(user1_id)
-        await goal_service.clear_all_goals(user2_id)
     
-    async def test_metrics_reset(self):
+    async def test_metrics_reset(self, fresh_goal_service):
         """Testa se o reset de métricas funciona corretamente"""
         user_id = 999009
-        mes = datetime.now().month
-        ano = datetime.now().year
+        now = datetime.now()
+        mes, ano = now.month, now.year
         
         # Criar algumas operações
-        await goal_service.create_or_update_goal(
+        await fresh_goal_service.create_or_update_goal(
             user_id=user_id,
             categoria=ExpenseCategory.OUTROS,
             valor_meta=Decimal("500.00"),
@@ -326,17 +318,17 @@ class TestPerformanceOptimization:
             ano=ano
         )
         
-        await goal_service.get_user_goals(user_id, mes, ano)
+        await fresh_goal_service.get_user_goals(user_id, mes, ano)
         
         # Verificar que há métricas
-        metrics_before = goal_service.get_metrics()
+        metrics_before = fresh_goal_service.get_metrics()
         assert metrics_before["goals_created"] > 0 or metrics_before["goals_queried"] > 0
         
         # Resetar métricas
-        goal_service.reset_metrics()
+        fresh_goal_service.reset_metrics()
         
         # Verificar que as métricas foram zeradas
-        metrics_after = goal_service.get_metrics()
+        metrics_after = fresh_goal_service.get_metrics()
         assert metrics_after["goals_created"] == 0
         assert metrics_after["goals_updated"] == 0
         assert metrics_after["goals_deleted"] == 0
@@ -344,6 +336,74 @@ class TestPerformanceOptimization:
         assert metrics_after["cache_hits"] == 0
         assert metrics_after["cache_misses"] == 0
         assert metrics_after["alerts_sent"] == 0
+    
+    async def test_clear_all_goals_invalidates_user_cache(self, fresh_goal_service):
+        """Testa se a limpeza remove as metas de todos os períodos e só o cache do usuário"""
+        user_id = 999010
+        other_user_id = 999011
+        now = datetime.now()
+        mes, ano = now.month, now.year
+        
+        # Metas em dois períodos para o usuário e uma para outro usuário
+        await fresh_goal_service.create_or_update_goals_bulk([
+            {"user_id": user_id, "categoria": ExpenseCategory.CASA,
+             "valor_meta": Decimal("100.00"), "mes": mes, "ano": ano},
+            {"user_id": user_id, "categoria": ExpenseCategory.LAZER,
+             "valor_meta": Decimal("100.00"), "mes": mes, "ano": ano - 1},
+            {"user_id": other_user_id, "categoria": ExpenseCategory.CASA,
+             "valor_meta": Decimal("100.00"), "mes": mes, "ano": ano}
+        ])
+        
+        # Popular o cache dos dois usuários
+        await fresh_goal_service.get_user_goals(user_id, mes, ano)
+        await fresh_goal_service.get_user_goals(other_user_id, mes, ano)
+        
+        removed = await fresh_goal_service.clear_all_goals(user_id)
+        
+        assert removed == 2
+        assert fresh_goal_service.get_metrics()["goals_deleted"] == 2
+        assert fresh_goal_service._get_cache_key(user_id, mes, ano) not in fresh_goal_service._goals_cache
+        assert fresh_goal_service._get_cache_key(other_user_id, mes, ano) in fresh_goal_service._goals_cache
+        assert await fresh_goal_service.get_user_goals(user_id, mes, ano) == []
+        assert len(await fresh_goal_service.get_user_goals(other_user_id, mes, ano)) == 1
+        
+        # Sem metas restantes, a limpeza é um no-op
+        assert await fresh_goal_service.clear_all_goals(user_id) == 0
+    
+    async def test_bulk_upsert_creates_and_updates(self, fresh_goal_service):
+        """Testa se a gravação em lote cria metas novas, atualiza as existentes e invalida o cache"""
+        user_id = 999012
+        now = datetime.now()
+        mes, ano = now.month, now.year
         
-        # Limpar
-        await goal_service.clear_all_goals(user_id)
+        await fresh_goal_service.create_or_update_goal(
+            user_id=user_id,
+            categoria=ExpenseCategory.CASA,
+            valor_meta=Decimal("100.00"),
+            mes=mes,
+            ano=ano
+        )
+        await fresh_goal_service.get_user_goals(user_id, mes, ano)
+        fresh_goal_service.reset_metrics()
+        
+        written = await fresh_goal_service.create_or_update_goals_bulk([
+            {"user_id": user_id, "categoria": ExpenseCategory.CASA,
+             "valor_meta": Decimal("150.00"), "mes": mes, "ano": ano},
+            {"user_id": user_id, "categoria": ExpenseCategory.SAUDE,
+             "valor_meta": Decimal("200.00"), "mes": mes, "ano": ano}
+        ])
+        
+        assert written == 2
+        metrics = fresh_goal_service.get_metrics()
+        assert metrics["goals_created"] == 1
+        assert metrics["goals_updated"] == 1
+        
+        # Cache invalidado: a consulta reflete o valor atualizado e a meta nova
+        goals = {goal.categoria: goal.valor_meta for goal in await fresh_goal_service.get_user_goals(user_id, mes, ano)}
+        assert goals == {ExpenseCategory.CASA: Decimal("150.00"), ExpenseCategory.SAUDE: Decimal("200.00")}
+        
+        with pytest.raises(ValueError):
+            await fresh_goal_service.create_or_update_goals_bulk([
+                {"user_id": user_id, "categoria": ExpenseCategory.CASA,
+                 "valor_meta": Decimal("0"), "mes": mes, "ano": ano}
+            ])
@@ -0,0 +1,39 @@
+"""
+Testes das sessões assíncronas do banco SQLite
+"""
+
+import pytest
+from sqlalchemy import select
+
+from database.models import Goal
+from database.sqlite_db import db_session, get_db_session
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.mark.usefixtures("in_memory_sqlite")
+class TestDbSession:
+    """Testes do fechamento das sessões ao retornar de dentro do bloco"""
+
+    async def test_db_session_closed_on_return(self):
+        """Com db_session, a sessão é fechada antes de o return chegar ao chamador"""
+        async def first_goal():
+            async with db_session() as db:
+                await db.execute(select(Goal.id).limit(1))
+                return db
+
+        db = await first_goal()
+
+        assert not db.in_transaction()
+
+    async def test_get_db_session_left_open_on_return(self):
+        """Com get_db_session, a sessão fica aberta até o loop finalizar o gerador"""
+        async def first_goal():
+            async for db in get_db_session():
+                await db.execute(select(Goal.id).limit(1))
+                return db
+
+        db = await first_goal()
+
+        assert db.in_transaction()
+        await db.close()
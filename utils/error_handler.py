@@ -3,16 +3,55 @@ Utilitário para tratamento robusto de erros do sistema de transcrição de áud
 """
 
 import logging
-from typing import Dict, Any, Optional
-from datetime import datetime
+import re
+from array import array
+from collections import deque
+from functools import lru_cache
+from statistics import fmean
+from types import MappingProxyType
+from typing import Deque, Dict, Any, Mapping, Optional, Pattern, Sequence, Tuple
 from loguru import logger
 
 
+# Erros recuperáveis (podem ser tentados novamente): network, api_limit, disk_space
+_RECOVERABLE_CATEGORIES = frozenset({'network', 'api_limit', 'disk_space'})
+
+# Nível de log e ícone por categoria; as demais são logadas como erro
+_LOG_LEVEL_BY_CATEGORY: Mapping[str, Tuple[str, str]] = MappingProxyType({
+    'network': ('WARNING', '⚠️'),
+    'api_limit': ('WARNING', '⚠️'),
+    'corruption': ('INFO', 'ℹ️'),
+    'validation': ('INFO', 'ℹ️'),
+    'file_format': ('INFO', 'ℹ️'),
+})
+_DEFAULT_LOG_LEVEL: Tuple[str, str] = ('ERROR', '❌')
+
+
+def _compile_keyword_pattern(keywords: Mapping[str, Tuple[str, ...]], priority_order: Sequence[str]) -> Pattern:
+    """
+    Compilar as palavras-chave de todas as categorias em um único padrão.
+    
+    Cada categoria vira um grupo nomeado dentro de um lookahead, na ordem de
+    prioridade. Assim uma única varredura da mensagem encontra, em cada posição,
+    a categoria mais prioritária cuja palavra-chave começa ali.
+    """
+    groups = [
+        f"(?P<{category}>{'|'.join(re.escape(keyword) for keyword in keywords[category])})"
+        for category in priority_order
+    ]
+    return re.compile(f"(?=(?:{'|'.join(groups)}))")
+
+
+def _index_messages_by_category(categories: Mapping[str, str], messages: Mapping[str, str]) -> Dict[str, str]:
+    """Indexar as mensagens amigáveis pelo valor da categoria"""
+    return {categories[key]: message for key, message in messages.items()}
+
+
 class AudioErrorHandler:
     """Classe para tratamento centralizado de erros de áudio"""
     
     # Categorias de erro
-    ERROR_CATEGORIES = {
+    ERROR_CATEGORIES = MappingProxyType({
         'NETWORK': 'network',
         'FILE_FORMAT': 'file_format',
         'FILE_SIZE': 'file_size',
@@ -22,46 +61,53 @@ class AudioErrorHandler:
         'CORRUPTION': 'corruption',
         'VALIDATION': 'validation',
         'UNKNOWN': 'unknown'
-    }
+    })
     
-    # Mapeamento de palavras-chave para categorias
-    ERROR_KEYWORDS = {
-        'NETWORK': [
+    # Mapeamento de palavras-chave para categorias (somente leitura)
+    ERROR_KEYWORDS = MappingProxyType({
+        'NETWORK': (
             'network', 'connection', 'timeout', 'internet', 'connectivity',
             'dns', 'socket', 'unreachable', 'refused'
-        ],
-        'FILE_FORMAT': [
+        ),
+        'FILE_FORMAT': (
             'format', 'extension', 'mime', 'type', 'unsupported',
             'invalid format', 'not supported'
-        ],
-        'FILE_SIZE': [
+        ),
+        'FILE_SIZE': (
             'file too large', 'file size', 'size limit', 'maximum file size',
             'too big', 'too large', 'file is too big'
-        ],
-        'API_LIMIT': [
+        ),
+        'API_LIMIT': (
             'rate limit', 'quota', 'billing', 'rate limit exceeded',
             '429', 'too many requests'
-        ],
-        'PERMISSION': [
+        ),
+        'PERMISSION': (
             'permission', 'access', 'denied', 'unauthorized', 'forbidden',
             '401', '403', 'authentication'
-        ],
-        'DISK_SPACE': [
+        ),
+        'DISK_SPACE': (
             'disk', 'space', 'storage', 'full', 'no space',
             'insufficient space'
-        ],
-        'CORRUPTION': [
+        ),
+        'CORRUPTION': (
             'corrupt', 'corrupted', 'invalid', 'malformed', 'damaged',
             'broken', 'unreadable'
-        ],
-        'VALIDATION': [
+        ),
+        'VALIDATION': (
             'validation', 'invalid', 'missing', 'empty', 'null',
             'required', 'mandatory'
-        ]
-    }
+        )
+    })
+    
+    # Ordem de prioridade das categorias (mais específicas primeiro)
+    PRIORITY_ORDER = ('API_LIMIT', 'NETWORK', 'FILE_FORMAT', 'FILE_SIZE',
+                      'PERMISSION', 'DISK_SPACE', 'CORRUPTION', 'VALIDATION')
+    
+    # Padrão pré-compilado com as palavras-chave de todas as categorias
+    _KEYWORD_PATTERN = _compile_keyword_pattern(ERROR_KEYWORDS, PRIORITY_ORDER)
     
     # Mensagens de erro amigáveis
-    ERROR_MESSAGES = {
+    ERROR_MESSAGES = MappingProxyType({
         'NETWORK': "Erro de conexão. Verifique sua internet e tente novamente.",
         'FILE_FORMAT': "Formato de áudio não suportado. Use MP3, WAV, M4A ou WebM.",
         'FILE_SIZE': "Arquivo muito grande. O limite é 25MB. Tente dividir o áudio em partes menores.",
@@ -71,30 +117,25 @@ class AudioErrorHandler:
         'CORRUPTION': "Arquivo de áudio corrompido ou ilegível. Tente gravar novamente.",
         'VALIDATION': "Dados do áudio inválidos. Tente enviar o áudio novamente.",
         'UNKNOWN': "Erro inesperado. Tente novamente ou use mensagem de texto."
-    }
+    })
+    
+    # Mensagens indexadas diretamente pelo valor da categoria ('network', 'file_size', ...)
+    _MESSAGES_BY_CATEGORY = MappingProxyType(_index_messages_by_category(ERROR_CATEGORIES, ERROR_MESSAGES))
     
     @classmethod
     def categorize_error(cls, error: Exception) -> str:
         """Categorizar erro baseado na mensagem"""
-        error_msg = str(error).lower()
-        
-        # Verificar categorias em ordem de prioridade (mais específicas primeiro)
-        priority_order = ['API_LIMIT', 'NETWORK', 'FILE_FORMAT', 'FILE_SIZE', 
-                         'PERMISSION', 'DISK_SPACE', 'CORRUPTION', 'VALIDATION']
-        
-        for category in priority_order:
-            keywords = cls.ERROR_KEYWORDS[category]
-            if any(keyword in error_msg for keyword in keywords):
-                return cls.ERROR_CATEGORIES[category]
-        
-        return cls.ERROR_CATEGORIES['UNKNOWN']
+        return _classify_message(str(error))[0]
     
     @classmethod
     def get_user_friendly_message(cls, error: Exception, context: Optional[Dict[str, Any]] = None) -> str:
         """Obter mensagem amigável para o usuário"""
-        category = cls.categorize_error(error)
-        base_message = cls.ERROR_MESSAGES.get(category.upper(), cls.ERROR_MESSAGES['UNKNOWN'])
-        
+        category, base_message = _classify_message(str(error))
+        return cls._friendly_message_for(category, base_message, context)
+    
+    @classmethod
+    def _friendly_message_for(cls, category: str, base_message: str, context: Optional[Dict[str, Any]]) -> str:
+        """Mensagem amigável de uma categoria já calculada, com o contexto aplicado"""
         # Adicionar contexto específico se disponível
         if context:
             if category == 'file_size' and 'actual_size' in context:
@@ -108,23 +149,20 @@ class AudioErrorHandler:
     @classmethod
     def log_error(cls, error: Exception, context: Optional[Dict[str, Any]] = None, user_id: Optional[int] = None):
         """Logar erro com contexto detalhado"""
-        category = cls.categorize_error(error)
+        cls._log_categorized(error, cls.categorize_error(error), context, user_id)
+    
+    @classmethod
+    def _log_categorized(cls, error: Exception, category: str, context: Optional[Dict[str, Any]],
+                         user_id: Optional[int]):
+        """Logar erro cuja categoria já foi calculada"""
+        message = str(error)
         
-        log_data = {
-            'error_category': category,
-            'error_message': str(error),
-            'user_id': user_id,
-            'timestamp': datetime.now().isoformat(),
-            'context': context or {}
-        }
+        # O loguru já carimba o horário de cada record; o contexto segue estruturado em extra
+        bound_logger = logger.bind(error_category=category, user_id=user_id, context=context or {})
         
         # Log com nível apropriado baseado na categoria
-        if category in ['network', 'api_limit']:
-            logger.warning(f"⚠️ [{category.upper()}] {str(error)} | User: {user_id} | Context: {context}")
-        elif category in ['corruption', 'validation', 'file_format']:
-            logger.info(f"ℹ️ [{category.upper()}] {str(error)} | User: {user_id} | Context: {context}")
-        else:
-            logger.error(f"❌ [{category.upper()}] {str(error)} | User: {user_id} | Context: {context}")
+        level, icon = _LOG_LEVEL_BY_CATEGORY.get(category, _DEFAULT_LOG_LEVEL)
+        bound_logger.log(level, f"{icon} [{category.upper()}] {message} | User: {user_id} | Context: {context}")
     
     @classmethod
     def handle_audio_error(cls, error: Exception, user_id: Optional[int] = None, 
@@ -136,20 +174,19 @@ class AudioErrorHandler:
         if file_id:
             full_context['file_id'] = file_id
         
+        # Categorizar uma única vez para o log e para a mensagem (em cache para erros repetidos)
+        category, base_message = _classify_message(str(error))
+        
         # Logar erro
-        cls.log_error(error, full_context, user_id)
+        cls._log_categorized(error, category, full_context, user_id)
         
-        # Retornar mensagem amigável
-        return cls.get_user_friendly_message(error, full_context)
+        # Retornar mensagem amigável; só a parte que depende do contexto é montada por chamada
+        return cls._friendly_message_for(category, base_message, full_context)
     
     @classmethod
     def is_recoverable_error(cls, error: Exception) -> bool:
         """Verificar se o erro é recuperável (pode tentar novamente)"""
-        category = cls.categorize_error(error)
-        
-        # Erros recuperáveis: network, api_limit, disk_space
-        recoverable_categories = ['network', 'api_limit', 'disk_space']
-        return category in recoverable_categories
+        return cls.categorize_error(error) in _RECOVERABLE_CATEGORIES
     
     @classmethod
     def get_retry_delay(cls, error: Exception, attempt: int) -> float:
@@ -169,19 +206,61 @@ class AudioErrorHandler:
         return base_delay * (2 ** attempt)
 
 
+@lru_cache(maxsize=1024)
+def _classify_message(message: str) -> Tuple[str, str]:
+    """
+    Categoria e mensagem amigável base de uma mensagem de erro (resultado em cache).
+    
+    A chave é a mensagem original, então erros repetidos em laços de retry
+    não refazem nem o lower() nem a varredura das palavras-chave.
+    """
+    category = _categorize_message(message.lower())
+    return category, AudioErrorHandler._MESSAGES_BY_CATEGORY.get(
+        category, AudioErrorHandler.ERROR_MESSAGES['UNKNOWN']
+    )
+
+
+def _categorize_message(error_msg: str) -> str:
+    """Categorizar mensagem de erro já normalizada"""
+    # Uma única varredura coleta todas as categorias presentes na mensagem
+    matched = {match.lastgroup for match in AudioErrorHandler._KEYWORD_PATTERN.finditer(error_msg)}
+    
+    # Verificar categorias em ordem de prioridade (mais específicas primeiro)
+    for category in AudioErrorHandler.PRIORITY_ORDER:
+        if category in matched:
+            return AudioErrorHandler.ERROR_CATEGORIES[category]
+    
+    return AudioErrorHandler.ERROR_CATEGORIES['UNKNOWN']
+
+
+# Posição de cada categoria no vetor de contadores de AudioProcessingMetrics
+_CATEGORY_NAMES: Tuple[str, ...] = tuple(AudioErrorHandler.ERROR_CATEGORIES.values())
+_CATEGORY_INDEX: Mapping[str, int] = MappingProxyType(
+    {category: index for index, category in enumerate(_CATEGORY_NAMES)}
+)
+
+
 class AudioProcessingMetrics:
     """Classe para coletar métricas de processamento de áudio"""
     
+    __slots__ = ('error_counts', 'processing_times', 'success_count', 'total_attempts')
+    
+    # Quantidade de tempos de processamento mantidos para a média
+    MAX_PROCESSING_SAMPLES = 100
+    
     def __init__(self):
-        self.error_counts: Dict[str, int] = {}
-        self.processing_times: Dict[str, float] = {}
+        # Contadores densos indexados pela posição da categoria em _CATEGORY_NAMES
+        self.error_counts: array = array('Q', [0] * len(_CATEGORY_NAMES))
+        # Janela limitada: append é O(1) e o tempo mais antigo sai automaticamente
+        self.processing_times: Dict[str, Deque[float]] = {
+            'transcription': deque(maxlen=self.MAX_PROCESSING_SAMPLES)
+        }
         self.success_count = 0
         self.total_attempts = 0
     
     def record_error(self, error: Exception):
         """Registrar erro nas métricas"""
-        category = AudioErrorHandler.categorize_error(error)
-        self.error_counts[category] = self.error_counts.get(category, 0) + 1
+        self.error_counts[_CATEGORY_INDEX[AudioErrorHandler.categorize_error(error)]] += 1
         self.total_attempts += 1
     
     def record_success(self, processing_time: float):
@@ -189,11 +268,9 @@ class AudioProcessingMetrics:
         self.success_count += 1
         self.total_attempts += 1
         
-        # Registrar tempo de processamento
+        # Registrar tempo de processamento (a deque mantém só os últimos 100)
         if processing_time > 0:
-            times = self.processing_times.get('transcription', [])
-            times.append(processing_time)
-            self.processing_times['transcription'] = times[-100:]  # Manter últimas 100
+            self.processing_times['transcription'].append(processing_time)
     
     def get_success_rate(self) -> float:
         """Calcular taxa de sucesso"""
@@ -203,10 +280,10 @@ class AudioProcessingMetrics:
     
     def get_average_processing_time(self) -> float:
         """Calcular tempo médio de processamento"""
-        times = self.processing_times.get('transcription', [])
+        times = self.processing_times['transcription']
         if not times:
             return 0.0
-        return sum(times) / len(times)
+        return fmean(times)
     
     def get_error_summary(self) -> Dict[str, Any]:
         """Obter resumo de erros"""
@@ -214,7 +291,11 @@ class AudioProcessingMetrics:
             'total_attempts': self.total_attempts,
             'success_count': self.success_count,
             'success_rate': self.get_success_rate(),
-            'error_counts': self.error_counts.copy(),
+            'error_counts': {
+                category: count
+                for category, count in zip(_CATEGORY_NAMES, self.error_counts)
+                if count
+            },
             'avg_processing_time': self.get_average_processing_time()
         }
 
@@ -2,13 +2,29 @@
 Utilidades gerais da aplicação
 """
 
+import calendar
 import hashlib
+import unicodedata
+from functools import lru_cache
 from datetime import datetime, date
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple, Union
 import json
 from decimal import Decimal
 
 
+def _strip_combining(text: str) -> str:
+    """Decompor o texto (NFKD) e descartar marcas combinantes"""
+    normalized = unicodedata.normalize('NFKD', text)
+    return ''.join([c for c in normalized if not unicodedata.combining(c)])
+
+
+# Tabela de tradução para os acentos do português, aplicada em C por str.translate
+_ACCENTED_CHARS = "áàâãäéèêëíìîïóòôõöúùûüçñ"
+_ACCENT_TABLE = str.maketrans({
+    c: _strip_combining(c) for c in _ACCENTED_CHARS + _ACCENTED_CHARS.upper()
+})
+
+
 class CustomJSONEncoder(json.JSONEncoder):
     """Encoder JSON personalizado"""
 
@@ -46,6 +62,37 @@ def parse_date_text(text: str) -> date:
     return today
 
 
+def strip_accents(text: str) -> str:
+    """Remover acentos de um texto"""
+    if text.isascii():
+        return text
+
+    stripped = text.translate(_ACCENT_TABLE)
+    if stripped.isascii():
+        return stripped
+
+    # Caracteres fora da tabela: usar a decomposição Unicode completa
+    return _strip_combining(text)
+
+
+@lru_cache(maxsize=512)
+def parse_money(text: str) -> Decimal:
+    """Converter valor monetário em texto (vírgula ou ponto decimal) para Decimal"""
+    return Decimal(text.replace(',', '.'))
+
+
+def calculate_progress_percent(spent: Union[Decimal, float], goal: Union[Decimal, float]) -> float:
+    """
+    Calcular percentual gasto de uma meta em float.
+
+    O arredondamento absorve o ruído de ponto flutuante, mantendo exatos os
+    limites de alerta (80% e 100%) para valores monetários com centavos.
+    """
+    if goal <= 0:
+        return 0.0
+    return round(float(spent) / float(goal) * 100.0, 12)
+
+
 def extract_numbers(text: str) -> List[float]:
     """Extrair números de um texto"""
     import re
@@ -80,6 +127,21 @@ def validate_spreadsheet_id(spreadsheet_id: str) -> bool:
     return bool(re.match(pattern, spreadsheet_id)) and len(spreadsheet_id) > 20
 
 
+def is_valid_month(month: int) -> bool:
+    """Verificar se o mês está entre 1 e 12"""
+    return 0 < month < 13
+
+
+def month_date_range(year: int, month: int) -> Tuple[date, date]:
+    """Primeiro e último dia do mês, para filtrar por intervalo em vez de extract()"""
+    return date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1])
+
+
+def year_date_range(year: int) -> Tuple[date, date]:
+    """Primeiro e último dia do ano"""
+    return date(year, 1, 1), date(year, 12, 31)
+
+
 def get_month_name(month_number: int) -> str:
     """Obter nome do mês em português"""
     months = {
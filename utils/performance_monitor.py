@@ -3,10 +3,232 @@ Utilitário para monitoramento de performance do sistema de metas
 """
 
 import asyncio
+import sys
+import time
+from bisect import bisect_right
 from datetime import datetime
-from typing import Dict, Any
+from typing import Callable, Dict, Any, List, Mapping, Optional, Tuple
 from loguru import logger
-from services.goal_service import goal_service
+from config.settings import get_settings
+from services.goal_service import MetricCounter, goal_service
+
+
+# Por quanto tempo um snapshot de goal_service.get_metrics() é reaproveitado
+METRICS_CACHE_TTL_SECONDS = 1.0
+
+# Por quanto tempo status de saúde e eficiência do cache calculados são reaproveitados
+HEALTH_CACHE_TTL_SECONDS = 2.0
+
+# nome do valor -> (instante monotônico do cálculo, valor)
+_snapshots: Dict[str, Tuple[float, Any]] = {}
+
+
+def _cached(name: str, ttl: float, compute: Callable[[], Any]) -> Any:
+    """Valor de compute(), recalculado no máximo uma vez a cada ttl segundos"""
+    now = time.monotonic()
+    snapshot = _snapshots.get(name)
+    if snapshot is not None and now - snapshot[0] < ttl:
+        return snapshot[1]
+    
+    value = compute()
+    _snapshots[name] = (now, value)
+    return value
+
+
+def _get_metrics() -> Mapping[str, Any]:
+    """Métricas do goal_service, lidas no máximo uma vez por METRICS_CACHE_TTL_SECONDS"""
+    return _cached("metrics", METRICS_CACHE_TTL_SECONDS, goal_service.get_metrics)
+
+
+def _invalidate_snapshots():
+    """Descarta métricas, saúde e eficiência em cache, forçando novo cálculo"""
+    _snapshots.clear()
+
+
+# (segundo Unix, datetime.now().isoformat() lido nesse segundo)
+_timestamp_cache: Tuple[int, str] = (0, "")
+
+
+def _iso_now_cached() -> str:
+    """Instante atual em ISO 8601, formatado no máximo uma vez por segundo"""
+    global _timestamp_cache
+    second = int(time.time())
+    if second != _timestamp_cache[0]:
+        _timestamp_cache = (second, datetime.now().isoformat())
+    return _timestamp_cache[1]
+
+
+# Quantos meses antes do corte a limpeza percorre em janelas; o que for
+# mais antigo que isso é removido de uma vez na última janela
+CLEANUP_FLOOR_MONTHS = 120
+
+Period = Tuple[int, int]
+
+
+def _cleanup_windows(
+    cutoff: Period,
+    batch_months: int,
+    floor_months: int,
+    watermark: Optional[Period] = None
+) -> List[Tuple[Optional[Period], Period]]:
+    """
+    Janelas [início, fim) de limpeza, da mais antiga até o corte.
+    
+    Sem marca d'água, a primeira janela não tem início e cobre tudo o que é
+    anterior ao piso; com ela, as janelas começam na marca d'água.
+    """
+    if batch_months < 1:
+        raise ValueError("batch_months deve ser pelo menos 1")
+    
+    def to_index(period: Period) -> int:
+        return period[0] * 12 + period[1] - 1
+    
+    def to_period(index: int) -> Period:
+        return index // 12, index % 12 + 1
+    
+    end = to_index(cutoff)
+    floor = end - floor_months
+    start = to_index(watermark) if watermark is not None else None
+    windows: List[Tuple[Optional[Period], Period]] = []
+    
+    if start is None or start < floor:
+        windows.append((None if start is None else to_period(start), to_period(floor)))
+        start = floor
+    
+    while start < end:
+        stop = min(start + batch_months, end)
+        windows.append((to_period(start), to_period(stop)))
+        start = stop
+    return windows
+
+
+# Recomendação por faixa de taxa de acerto: abaixo de 40%, de 40% a 80%, a partir de 80%
+_HIT_RATE_THRESHOLDS = (40, 80)
+_HIT_RATE_RECOMMENDATIONS = (
+    "Considere aumentar o TTL do cache para melhorar a taxa de acerto",
+    "Performance de cache adequada",
+    "Cache funcionando de forma otimizada",
+)
+
+# Regra de saúde: (predicado sobre métricas e eficiência do cache, problema, severidade)
+HealthRule = Tuple[Callable[[Mapping[str, Any], Dict[str, Any]], bool], str, int]
+
+_settings = get_settings()
+
+_HEALTH_RULES: Tuple[HealthRule, ...] = (
+    (
+        lambda m, e: e['hit_rate_percent'] < _settings.health_min_cache_hit_rate,
+        "Taxa de acerto do cache baixa",
+        1,
+    ),
+    (
+        lambda m, e: m['cache_size'] > _settings.health_max_cache_size,
+        "Cache muito grande",
+        1,
+    ),
+    (
+        lambda m, e: m['active_cooldowns'] > _settings.health_max_active_cooldowns,
+        "Muitos cooldowns ativos",
+        1,
+    ),
+    (
+        lambda m, e: m['cache_hit_rate_percent'] - m['cache_hit_rate_ewma'] > _settings.health_max_hit_rate_drop,
+        "Taxa de acerto recente do cache em queda",
+        1,
+    ),
+)
+
+# Severidade somada a partir da qual o status passa a warning / critical
+_WARNING_SEVERITY = 1
+_CRITICAL_SEVERITY = 3
+
+
+_RULE = "=" * 60
+
+# Emoji dos relatórios (e o seletor de variação que os acompanha), removidos
+# quando a saída não é um terminal e vai para arquivos ou coletores de log
+_EMOJI_TABLE = str.maketrans("", "", "📊🎯💾🔔⏱🏥🧹⚠✅❌🔄\ufe0f")
+
+
+def _write(text: str):
+    """Escreve no stdout de uma só vez, sem emoji quando a saída não é um terminal"""
+    if not sys.stdout.isatty():
+        text = text.translate(_EMOJI_TABLE)
+    sys.stdout.write(text)
+
+
+# Relatório de métricas: preenchido com um único format_map sobre as métricas
+_REPORT_TEMPLATE = (
+    "{rule}\n"
+    "📊 RELATÓRIO DE PERFORMANCE - SISTEMA DE METAS\n"
+    "{rule}\n"
+    "\n"
+    "🎯 Operações de Metas:\n"
+    "  • Metas criadas: {goals_created}\n"
+    "  • Metas atualizadas: {goals_updated}\n"
+    "  • Metas deletadas: {goals_deleted}\n"
+    "  • Consultas realizadas: {goals_queried}\n"
+    "\n"
+    "💾 Performance de Cache:\n"
+    "  • Cache hits: {cache_hits}\n"
+    "  • Cache misses: {cache_misses}\n"
+    "  • Taxa de acerto: {cache_hit_rate_percent:.2f}%\n"
+    "  • Taxa de acerto recente (média móvel): {cache_hit_rate_ewma:.2f}%\n"
+    "  • Tamanho do cache: {cache_size} período(s)\n"
+    "\n"
+    "🔔 Alertas:\n"
+    "  • Alertas enviados: {alerts_sent}\n"
+    "  • Cooldowns ativos: {active_cooldowns}\n"
+    "\n"
+    "⏱️ Tempo de Execução:\n"
+    "  • Uptime: {uptime_seconds:.2f} segundos\n"
+    "  • Último reset: {last_reset_fmt}\n"
+    "\n"
+    "{rule}"
+)
+
+# Séries expostas no formato texto do Prometheus: (nome, tipo, ajuda, origem do valor);
+# contadores vêm por índice dos contadores brutos, gauges por chave das métricas
+_PROMETHEUS_SERIES = (
+    ("goals_created_total", "counter", "Metas criadas", MetricCounter.GOALS_CREATED),
+    ("goals_updated_total", "counter", "Metas atualizadas", MetricCounter.GOALS_UPDATED),
+    ("goals_deleted_total", "counter", "Metas deletadas", MetricCounter.GOALS_DELETED),
+    ("goals_queried_total", "counter", "Consultas de metas realizadas", MetricCounter.GOALS_QUERIED),
+    ("goals_cache_hits_total", "counter", "Acertos do cache de metas", MetricCounter.CACHE_HITS),
+    ("goals_cache_misses_total", "counter", "Faltas do cache de metas", MetricCounter.CACHE_MISSES),
+    ("goals_alerts_sent_total", "counter", "Alertas de metas enviados", MetricCounter.ALERTS_SENT),
+    ("goals_cache_hit_rate_percent", "gauge", "Taxa de acerto do cache de metas", "cache_hit_rate_percent"),
+    ("goals_cache_hit_rate_ewma_percent", "gauge", "Média móvel da taxa de acerto do cache de metas", "cache_hit_rate_ewma"),
+    ("goals_cache_size", "gauge", "Períodos no cache de metas", "cache_size"),
+    ("goals_active_cooldowns", "gauge", "Cooldowns de alerta ativos", "active_cooldowns"),
+    ("goals_metrics_uptime_seconds", "gauge", "Segundos desde o último reset das métricas", "uptime_seconds"),
+)
+
+# Montado uma vez; cada exposição é um único format, com os contadores como
+# argumentos posicionais ({0}, {1}, ...) e os gauges como nomeados
+_PROMETHEUS_TEMPLATE = "".join(
+    f"# HELP finance_bot_{name} {help_text}\n"
+    f"# TYPE finance_bot_{name} {kind}\n"
+    f"finance_bot_{name} {{{source if isinstance(source, str) else int(source)}}}\n"
+    for name, kind, help_text, source in _PROMETHEUS_SERIES
+)
+
+# Banner do status de saúde; issues_block já vem formatado
+_HEALTH_TEMPLATE = (
+    "\n{rule}\n"
+    "🏥 STATUS DE SAÚDE DO SISTEMA\n"
+    "{rule}\n"
+    "\nStatus: {status_upper}\n"
+    "Timestamp: {timestamp}\n"
+    "Uptime: {uptime_seconds:.2f} segundos\n"
+    "Eficiência do Cache: {cache_efficiency}\n"
+    "{issues_block}\n"
+    "\n📊 Resumo de Métricas:\n"
+    "  • Total de operações: {total_operations}\n"
+    "  • Taxa de acerto do cache: {cache_hit_rate:.2f}%\n"
+    "  • Alertas enviados: {alerts_sent}\n"
+    "\n{rule}\n"
+)
 
 
 class PerformanceMonitor:
@@ -20,42 +242,33 @@ class PerformanceMonitor:
         Returns:
             String formatada com relatório de métricas
         """
-        metrics = goal_service.get_metrics()
+        metrics = _get_metrics()
+        
+        return _REPORT_TEMPLATE.format_map({
+            **metrics,
+            "rule": _RULE,
+            "last_reset_fmt": metrics['last_reset'].strftime('%Y-%m-%d %H:%M:%S'),
+        })
+    
+    @staticmethod
+    def get_prometheus_metrics() -> str:
+        """
+        Exporta as métricas no formato texto de exposição do Prometheus.
         
-        report = [
-            "=" * 60,
-            "📊 RELATÓRIO DE PERFORMANCE - SISTEMA DE METAS",
-            "=" * 60,
-            "",
-            "🎯 Operações de Metas:",
-            f"  • Metas criadas: {metrics['goals_created']}",
-            f"  • Metas atualizadas: {metrics['goals_updated']}",
-            f"  • Metas deletadas: {metrics['goals_deleted']}",
-            f"  • Consultas realizadas: {metrics['goals_queried']}",
-            "",
-            "💾 Performance de Cache:",
-            f"  • Cache hits: {metrics['cache_hits']}",
-            f"  • Cache misses: {metrics['cache_misses']}",
-            f"  • Taxa de acerto: {metrics['cache_hit_rate_percent']:.2f}%",
-            f"  • Tamanho do cache: {metrics['cache_size']} período(s)",
-            "",
-            "🔔 Alertas:",
-            f"  • Alertas enviados: {metrics['alerts_sent']}",
-            f"  • Cooldowns ativos: {metrics['active_cooldowns']}",
-            "",
-            "⏱️ Tempo de Execução:",
-            f"  • Uptime: {metrics['uptime_seconds']:.2f} segundos",
-            f"  • Último reset: {metrics['last_reset'].strftime('%Y-%m-%d %H:%M:%S')}",
-            "",
-            "=" * 60,
-        ]
+        Usa o mesmo snapshot de métricas dos relatórios, então scrapes frequentes
+        leem goal_service no máximo uma vez por METRICS_CACHE_TTL_SECONDS. Os
+        contadores saem brutos, sem descontar resets, para nunca diminuírem.
         
-        return "\n".join(report)
+        Returns:
+            Texto com linhas HELP, TYPE e valor de cada série
+        """
+        raw_counters = _cached("raw_counters", METRICS_CACHE_TTL_SECONDS, goal_service.get_raw_counters)
+        return _PROMETHEUS_TEMPLATE.format(*raw_counters, **_get_metrics())
     
     @staticmethod
     def print_metrics():
         """Imprime relatório de métricas no console"""
-        print(PerformanceMonitor.get_metrics_report())
+        _write(PerformanceMonitor.get_metrics_report() + "\n")
     
     @staticmethod
     def get_cache_efficiency() -> Dict[str, Any]:
@@ -65,8 +278,15 @@ class PerformanceMonitor:
         Returns:
             Dicionário com métricas de eficiência
         """
-        metrics = goal_service.get_metrics()
-        
+        return _cached(
+            "efficiency",
+            HEALTH_CACHE_TTL_SECONDS,
+            lambda: PerformanceMonitor._compute_efficiency(_get_metrics())
+        )
+    
+    @staticmethod
+    def _compute_efficiency(metrics: Mapping[str, Any]) -> Dict[str, Any]:
+        """Eficiência do cache a partir de métricas já lidas"""
         total_queries = metrics['cache_hits'] + metrics['cache_misses']
         hit_rate = (metrics['cache_hits'] / total_queries * 100) if total_queries > 0 else 0
         
@@ -91,23 +311,37 @@ class PerformanceMonitor:
     @staticmethod
     def _get_cache_recommendation(hit_rate: float, cache_size: int) -> str:
         """Gera recomendação baseada nas métricas de cache"""
-        if hit_rate < 40:
-            return "Considere aumentar o TTL do cache para melhorar a taxa de acerto"
-        elif cache_size > 100:
+        index = bisect_right(_HIT_RATE_THRESHOLDS, hit_rate)
+        # Taxa de acerto baixa tem precedência sobre o tamanho do cache
+        if index > 0 and cache_size > _settings.health_max_cache_size:
             return "Cache muito grande, considere implementar política de eviction"
-        elif hit_rate >= 80:
-            return "Cache funcionando de forma otimizada"
-        else:
-            return "Performance de cache adequada"
+        return _HIT_RATE_RECOMMENDATIONS[index]
     
     @staticmethod
-    async def cleanup_old_data(months_to_keep: int = 12, dry_run: bool = False) -> Dict[str, Any]:
+    async def cleanup_old_data(
+        months_to_keep: int = 12,
+        dry_run: bool = False,
+        batch_months: int = 1,
+        floor_months: int = CLEANUP_FLOOR_MONTHS,
+        resume: bool = True
+    ) -> Dict[str, Any]:
         """
         Executa limpeza de dados antigos.
         
+        A remoção é feita em janelas de batch_months meses, da mais antiga para a
+        mais recente, cada uma em sua própria transação, cedendo o loop entre elas
+        para não bloquear o tráfego do bot. Após cada janela a marca d'água avança,
+        e a próxima execução (ou a retomada de uma interrompida) começa dela.
+        
+        Metas criadas depois para períodos anteriores à marca d'água não são
+        revisitadas; use resume=False para percorrer todo o histórico.
+        
         Args:
             months_to_keep: Número de meses de histórico a manter
             dry_run: Se True, apenas simula a limpeza sem executar
+            batch_months: Tamanho de cada janela de remoção, em meses
+            floor_months: Meses antes do corte percorridos em janelas
+            resume: Se True, começa da marca d'água da última limpeza
             
         Returns:
             Dicionário com resultado da operação
@@ -116,21 +350,47 @@ class PerformanceMonitor:
         
         if dry_run:
             logger.info("⚠️ Modo DRY RUN - nenhuma alteração será feita")
-            # Em modo dry run, apenas retorna estimativa
-            return {
-                "dry_run": True,
-                "estimated_removals": "Não implementado",
-                "message": "Modo dry run - use dry_run=False para executar"
-            }
         
         try:
-            removed_count = await goal_service.cleanup_old_goals(months_to_keep)
+            cutoff = goal_service.get_cleanup_cutoff(months_to_keep)
+            watermark = await goal_service.get_cleanup_watermark() if resume else None
+            windows = _cleanup_windows(cutoff, batch_months, floor_months, watermark)
+            
+            if dry_run:
+                # As janelas são contíguas: conta de uma vez o que a execução real percorreria
+                estimated = (
+                    await goal_service.count_old_goals_range(windows[0][0], windows[-1][1])
+                    if windows else 0
+                )
+                return {
+                    "dry_run": True,
+                    "estimated_removals": estimated,
+                    "months_kept": months_to_keep,
+                    "message": f"Modo dry run: {estimated} meta(s) seriam removida(s) - use dry_run=False para executar"
+                }
+            
+            removed_count = 0
+            # Janelas vazias não gravam a marca d'água; ela é persistida na próxima
+            # janela com remoções ou, se as últimas forem vazias, ao final
+            watermark_pending = False
+            for start, end in windows:
+                removed = await goal_service.cleanup_old_goals_range(start, end, advance_watermark=True)
+                if removed is None:
+                    raise RuntimeError(f"falha ao limpar metas até {end[1]}/{end[0]}")
+                removed_count += removed
+                watermark = end
+                watermark_pending = removed == 0
+                await asyncio.sleep(0)
+            
+            if watermark_pending and not await goal_service.set_cleanup_watermark(watermark):
+                raise RuntimeError(f"falha ao registrar marca d'água {watermark[1]}/{watermark[0]}")
             
             result = {
                 "success": True,
                 "removed_count": removed_count,
                 "months_kept": months_to_keep,
-                "timestamp": datetime.now().isoformat(),
+                "watermark": f"{watermark[0]}-{watermark[1]:02d}" if watermark else None,
+                "timestamp": _iso_now_cached(),
                 "message": f"Limpeza concluída: {removed_count} meta(s) removida(s)"
             }
             
@@ -147,9 +407,16 @@ class PerformanceMonitor:
     
     @staticmethod
     def reset_all_metrics():
-        """Reseta todas as métricas do sistema"""
+        """
+        Reseta todas as métricas do sistema.
+        
+        Relatórios e status de saúde passam a contar a partir do reset, mas os
+        contadores exportados ao Prometheus continuam crescendo: o reset só
+        registra a época a descontar, preservando o rate() nos scrapes.
+        """
         logger.info("🔄 Resetando métricas do sistema")
         goal_service.reset_metrics()
+        _invalidate_snapshots()
         logger.info("✅ Métricas resetadas com sucesso")
     
     @staticmethod
@@ -157,29 +424,38 @@ class PerformanceMonitor:
         """
         Verifica status de saúde do sistema de metas.
         
+        Probes frequentes recebem o mesmo resultado por até HEALTH_CACHE_TTL_SECONDS.
+        
         Returns:
             Dicionário com status de saúde
         """
-        metrics = goal_service.get_metrics()
-        cache_efficiency = PerformanceMonitor.get_cache_efficiency()
+        return _cached("health", HEALTH_CACHE_TTL_SECONDS, PerformanceMonitor._compute_health)
+    
+    @staticmethod
+    def _compute_health() -> Dict[str, Any]:
+        """Status de saúde calculado a partir do snapshot de métricas"""
+        # Uma única leitura das métricas para o status e a eficiência do cache
+        metrics = _get_metrics()
+        cache_efficiency = PerformanceMonitor._compute_efficiency(metrics)
         
         # Determinar status geral
         issues = []
+        severity = 0
+        for predicate, issue, rule_severity in _HEALTH_RULES:
+            if predicate(metrics, cache_efficiency):
+                issues.append(issue)
+                severity += rule_severity
         
-        if cache_efficiency['hit_rate_percent'] < 40:
-            issues.append("Taxa de acerto do cache baixa")
-        
-        if metrics['cache_size'] > 100:
-            issues.append("Cache muito grande")
-        
-        if metrics['active_cooldowns'] > 50:
-            issues.append("Muitos cooldowns ativos")
-        
-        status = "healthy" if len(issues) == 0 else "warning" if len(issues) <= 2 else "critical"
+        if severity >= _CRITICAL_SEVERITY:
+            status = "critical"
+        elif severity >= _WARNING_SEVERITY:
+            status = "warning"
+        else:
+            status = "healthy"
         
         return {
             "status": status,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _iso_now_cached(),
             "uptime_seconds": metrics['uptime_seconds'],
             "cache_efficiency": cache_efficiency['efficiency_level'],
             "issues": issues,
@@ -205,26 +481,21 @@ def print_health():
     """Imprime status de saúde do sistema"""
     health = PerformanceMonitor.get_health_status()
     
-    print("\n" + "=" * 60)
-    print("🏥 STATUS DE SAÚDE DO SISTEMA")
-    print("=" * 60)
-    print(f"\nStatus: {health['status'].upper()}")
-    print(f"Timestamp: {health['timestamp']}")
-    print(f"Uptime: {health['uptime_seconds']:.2f} segundos")
-    print(f"Eficiência do Cache: {health['cache_efficiency']}")
-    
     if health['issues']:
-        print("\n⚠️ Problemas Detectados:")
-        for issue in health['issues']:
-            print(f"  • {issue}")
+        issues_block = "\n⚠️ Problemas Detectados:" + "".join(
+            f"\n  • {issue}" for issue in health['issues']
+        )
     else:
-        print("\n✅ Nenhum problema detectado")
+        issues_block = "\n✅ Nenhum problema detectado"
     
-    print("\n📊 Resumo de Métricas:")
-    print(f"  • Total de operações: {health['metrics_summary']['total_operations']}")
-    print(f"  • Taxa de acerto do cache: {health['metrics_summary']['cache_hit_rate']:.2f}%")
-    print(f"  • Alertas enviados: {health['metrics_summary']['alerts_sent']}")
-    print("\n" + "=" * 60 + "\n")
+    # Uma única escrita no stdout para o banner inteiro
+    _write(_HEALTH_TEMPLATE.format_map({
+        **health,
+        **health['metrics_summary'],
+        "rule": _RULE,
+        "status_upper": health['status'].upper(),
+        "issues_block": issues_block,
+    }) + "\n")
 
 
 async def cleanup_old_goals(months: int = 12, dry_run: bool = False):
@@ -237,32 +508,51 @@ async def cleanup_old_goals(months: int = 12, dry_run: bool = False):
     """
     result = await PerformanceMonitor.cleanup_old_data(months, dry_run)
     
-    print("\n" + "=" * 60)
-    print("🧹 LIMPEZA DE DADOS ANTIGOS")
-    print("=" * 60)
+    lines = [
+        "",
+        _RULE,
+        "🧹 LIMPEZA DE DADOS ANTIGOS",
+        _RULE,
+    ]
     
     if result.get('dry_run'):
-        print("\n⚠️ MODO DRY RUN - Nenhuma alteração foi feita")
+        lines += ["", "⚠️ MODO DRY RUN - Nenhuma alteração foi feita"]
+    
+    lines += ["", result['message']]
     
-    print(f"\n{result['message']}")
+    if result.get('dry_run'):
+        lines.append(f"  • Metas a remover: {result['estimated_removals']}")
+        lines.append(f"  • Meses mantidos: {result['months_kept']}")
     
     if result.get('success'):
-        print(f"  • Metas removidas: {result['removed_count']}")
-        print(f"  • Meses mantidos: {result['months_kept']}")
+        lines.append(f"  • Metas removidas: {result['removed_count']}")
+        lines.append(f"  • Meses mantidos: {result['months_kept']}")
+        if result.get('watermark'):
+            lines.append(f"  • Limpo até: {result['watermark']}")
     elif result.get('error'):
-        print(f"  • Erro: {result['error']}")
+        lines.append(f"  • Erro: {result['error']}")
+    
+    lines += ["", _RULE, "", ""]
     
-    print("\n" + "=" * 60 + "\n")
+    # Uma única escrita no stdout para o relatório inteiro
+    _write("\n".join(lines))
 
 
 if __name__ == "__main__":
-    import sys
+    # uvloop vem com uvicorn[standard] fora do Windows; sem ele, fica o loop padrão
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
     
     if len(sys.argv) > 1:
         command = sys.argv[1]
         
         if command == "metrics":
             print_metrics()
+        elif command == "prometheus":
+            print(PerformanceMonitor.get_prometheus_metrics(), end="")
         elif command == "health":
             print_health()
         elif command == "cleanup":
@@ -271,10 +561,11 @@ if __name__ == "__main__":
             asyncio.run(cleanup_old_goals(months, dry_run))
         elif command == "reset":
             PerformanceMonitor.reset_all_metrics()
-            print("✅ Métricas resetadas com sucesso")
+            _write("✅ Métricas resetadas com sucesso\n")
         else:
             print("Comandos disponíveis:")
             print("  metrics  - Exibir métricas de performance")
+            print("  prometheus - Exibir métricas no formato do Prometheus")
             print("  health   - Exibir status de saúde do sistema")
             print("  cleanup [months] [--dry-run] - Limpar metas antigas")
             print("  reset    - Resetar métricas")
@@ -282,6 +573,7 @@ if __name__ == "__main__":
         print("Uso: python -m utils.performance_monitor <comando>")
         print("\nComandos disponíveis:")
         print("  metrics  - Exibir métricas de performance")
+        print("  prometheus - Exibir métricas no formato do Prometheus")
         print("  health   - Exibir status de saúde do sistema")
         print("  cleanup [months] [--dry-run] - Limpar metas antigas")
         print("  reset    - Resetar métricas")